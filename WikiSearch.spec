@@ -1,45 +1,135 @@
 # -*- mode: python ; coding: utf-8 -*-
+#
+# Build profiles:
+#
+#   pyinstaller WikiSearch.spec                        # fast (default): one folder, starts without unpacking
+#   pyinstaller WikiSearch.spec -- --profile legacy    # the old single file, unpacked on every launch
+#
+# benchmarks/bench_bundle.py builds both and compares size and launch time.
+import argparse
+import sys
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--profile", choices=("fast", "legacy"), default="fast")
+parser.add_argument("--runtime-hook", action="append", default=[],
+                    help="extra runtime hook (used by the launch benchmark)")
+options = parser.parse_args()
+fast = options.profile == "fast"
+
+# Modules the app never imports. Pillow is only needed by create_icon.py.
+EXCLUDES = [
+    'PIL', 'tkinter', 'unittest', 'pydoc', 'doctest', 'pdb', 'xmlrpc', 'lib2to3',
+    'PyQt6.QtNetwork', 'PyQt6.QtQml', 'PyQt6.QtQuick', 'PyQt6.QtQuickWidgets',
+    'PyQt6.QtOpenGL', 'PyQt6.QtOpenGLWidgets', 'PyQt6.QtSql', 'PyQt6.QtSvg',
+    'PyQt6.QtSvgWidgets', 'PyQt6.QtPdf', 'PyQt6.QtPdfWidgets', 'PyQt6.QtMultimedia',
+    'PyQt6.QtMultimediaWidgets', 'PyQt6.QtWebEngineCore', 'PyQt6.QtWebEngineWidgets',
+    'PyQt6.QtBluetooth', 'PyQt6.QtPositioning', 'PyQt6.QtSensors', 'PyQt6.QtSerialPort',
+    'PyQt6.QtTest', 'PyQt6.QtDesigner', 'PyQt6.QtHelp', 'PyQt6.QtPrintSupport',
+    'PyQt6.QtDBus', 'PyQt6.QtXml', 'PyQt6.QtNfc', 'PyQt6.QtRemoteObjects',
+    'PyQt6.QtSpatialAudio', 'PyQt6.QtTextToSpeech', 'PyQt6.QtWebChannel',
+    'PyQt6.QtWebSockets', 'PyQt6.Qt3DCore',
+]
+
+# Qt files the app has no use for: no SVG or PDF images, no networking
+# through Qt, no translations, no embedded/VNC platforms. JPEG, GIF and WebP
+# readers stay for thumbnails; xcb, wayland and offscreen platforms stay.
+QT = 'PyQt6/Qt6/'
+UNUSED_QT_FILES = tuple(
+    [QT + 'translations/'] +
+    [QT + 'plugins/' + plugin for plugin in (
+        'tls/', 'networkinformation/', 'generic/', 'iconengines/', 'egldeviceintegrations/',
+        'imageformats/libqsvg', 'imageformats/libqpdf', 'imageformats/libqtiff',
+        'imageformats/libqicns', 'imageformats/libqico', 'imageformats/libqwbmp',
+        'imageformats/libqtga', 'platforms/libqlinuxfb', 'platforms/libqeglfs',
+        'platforms/libqvnc', 'platforms/libqvkkhrdisplay', 'platforms/libqminimalegl',
+        'wayland-decoration-client/libadwaita',
+    )] +
+    # The Qt libraries only the plugins above link against, both where they
+    # are collected and as the top-level links next to them
+    [prefix + library for library in ('Pdf', 'Svg', 'Network', 'EglFSDeviceIntegration')
+     for prefix in (QT + 'lib/libQt6', QT + 'lib/Qt', 'libQt6')]
+)
+
+
+def used(entry):
+    return not entry[0].replace('\\', '/').startswith(UNUSED_QT_FILES)
 
 
 a = Analysis(
     ['src/app.py'],
-    pathex=[],
+    pathex=['src'],
     binaries=[],
-    datas=[('src', 'src')],
+    datas=[('src/icon.icns', '.')] if fast else [('src', 'src')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
-    runtime_hooks=[],
-    excludes=[],
+    runtime_hooks=options.runtime_hook,
+    excludes=EXCLUDES if fast else [],
     noarchive=False,
-    optimize=0,
+    optimize=2 if fast else 0,
 )
+if fast:
+    a.binaries = [entry for entry in a.binaries if used(entry)]
+    a.datas = [entry for entry in a.datas if used(entry)]
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='WikiSearch',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon=['src/icon.icns'],
-)
-app = BUNDLE(
-    exe,
-    name='WikiSearch.app',
-    icon='src/icon.icns',
-    bundle_identifier=None,
-)
+if fast:
+    # onedir: nothing to unpack at launch
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='WikiSearch',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=sys.platform.startswith('linux'),
+        upx=False,  # decompressing Qt libraries on every launch costs more than it saves
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        icon=['src/icon.icns'],
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=sys.platform.startswith('linux'),
+        upx=False,
+        name='WikiSearch',
+    )
+    target = coll
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='WikiSearch',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        icon=['src/icon.icns'],
+    )
+    target = exe
+
+if sys.platform == 'darwin':
+    app = BUNDLE(
+        target,
+        name='WikiSearch.app',
+        icon='src/icon.icns',
+        bundle_identifier=None,
+    )
@@ -0,0 +1,128 @@
+"""Bundle size per module and launch-to-window time of the PyInstaller profiles
+
+Builds WikiSearch.spec in both profiles (fast: one folder; legacy: single
+file), then reports the largest parts of each bundle and the median time
+from starting the executable to the first paint of its window. Linux only:
+the window is painted on the offscreen platform.
+
+Run from the repository root:  python benchmarks/bench_bundle.py [--runs 5] [--no-build]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from PyInstaller.archive.readers import CArchiveReader, PKG_ITEM_PYZ
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+HOOK = os.path.join(ROOT, "benchmarks", "first_paint_hook.py")
+PROFILES = ("fast", "legacy")
+
+
+def build(profile, out):
+    subprocess.run(
+        [sys.executable, "-m", "PyInstaller", "--noconfirm", "--log-level", "WARN",
+         "--distpath", os.path.join(out, profile, "dist"),
+         "--workpath", os.path.join(out, profile, "build"),
+         "WikiSearch.spec", "--", "--profile", profile, "--runtime-hook", HOOK],
+        cwd=ROOT, check=True)
+
+
+def executable(profile, out):
+    dist = os.path.join(out, profile, "dist")
+    if profile == "fast":
+        return os.path.join(dist, "WikiSearch", "WikiSearch")
+    return os.path.join(dist, "WikiSearch")
+
+
+def group(name):
+    """Reporting bucket for a bundled file or module"""
+    parts = name.replace('\\', '/').split('/')
+    if parts[:3] == ['PyQt6', 'Qt6', 'plugins'] and len(parts) > 3:
+        return "/".join(parts[:4])
+    if parts[:3] == ['PyQt6', 'Qt6', 'lib'] or len(parts) == 1:
+        return name
+    return parts[0]
+
+
+def bundle_sizes(path):
+    """Bytes per bucket: the executable's archive (uncompressed, with Python
+    modules grouped by top-level package) plus, for a one-folder bundle, the
+    files next to it
+    """
+    sizes = Counter()
+    archive = CArchiveReader(path)
+    for name, (_, _, length, _, typecode) in archive.toc.items():
+        if typecode == PKG_ITEM_PYZ:
+            # Modules are compressed one by one; count them as stored
+            for module, (_, _, module_length) in archive.open_embedded_archive(name).toc.items():
+                sizes["py: " + module.split('.')[0]] += module_length
+        else:
+            sizes[group(name)] += length
+    internal = os.path.join(os.path.dirname(path), "_internal")
+    for directory, _, files in os.walk(internal):
+        for file in files:
+            full = os.path.join(directory, file)
+            if not os.path.islink(full):
+                sizes[group(os.path.relpath(full, internal))] += os.path.getsize(full)
+    return sizes
+
+
+def total_size(path):
+    if not os.path.isdir(os.path.join(os.path.dirname(path), "_internal")):
+        return os.path.getsize(path)
+    folder = os.path.dirname(path)
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(folder)
+               for f in files if not os.path.islink(os.path.join(d, f)))
+
+
+def launch_ms(path):
+    """Milliseconds from exec to the window's first paint (see first_paint_hook.py)"""
+    with tempfile.TemporaryDirectory() as cache:
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen", XDG_CACHE_HOME=cache)
+        start = time.perf_counter()
+        proc = subprocess.Popen([path], env=env, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True)
+        line = proc.stdout.readline()
+        elapsed = (time.perf_counter() - start) * 1000
+        proc.wait(timeout=30)
+    if line.strip() != "painted":
+        raise RuntimeError(f"{path} never painted its window")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="largest parts to list per profile")
+    parser.add_argument("--out", default=os.path.join(ROOT, "build", "bench_bundle"),
+                        help="where the profiles are built")
+    parser.add_argument("--no-build", action="store_true", help="reuse bundles built before")
+    args = parser.parse_args(argv)
+    if not sys.platform.startswith("linux"):
+        parser.error("launch timing uses the offscreen Qt platform and is Linux only")
+
+    summary = []
+    for profile in PROFILES:
+        if not args.no_build:
+            build(profile, args.out)
+        path = executable(profile, args.out)
+        print(f"\n{profile} profile: {path}")
+        sizes = bundle_sizes(path)
+        for name, size in sizes.most_common(args.top):
+            print(f"    {size / 1e6:8.2f} MB  {name}")
+        launches = [launch_ms(path) for _ in range(args.runs)]
+        summary.append((profile, total_size(path), sum(sizes.values()), statistics.median(launches)))
+
+    print(f"\n{'profile':<8} {'on disk':>10} {'unpacked':>10} {'launch to window':>18}")
+    for profile, size, unpacked, launch in summary:
+        print(f"{profile:<8} {size / 1e6:7.1f} MB {unpacked / 1e6:7.1f} MB {launch:15.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""Listing a 100k-entry directory: the old iterdir() loader vs. scan_directory
+
+The old FileManagerApp.load_downloads read the directory twice with
+iterdir(), called is_dir()/is_file() on every entry and stat() twice per
+file, then show_folder_preview read it a third time. scan_directory reads
+it once with os.scandir and builds an EntryTable, then formats only the
+screenful of rows the virtual file list draws; the old loader formatted
+a listbox line for every entry. The app runs the new path on a
+ListingJob thread; its time to the first screenful and to the whole
+table are reported too.
+
+Filesystem calls are counted by wrapping os.stat/os.lstat/os.listdir/
+os.scandir and DirEntry.stat(); DirEntry.is_dir()/is_file() are free where
+the filesystem reports entry types (ext4, xfs, btrfs, tmpfs, APFS, NTFS).
+With strace installed the real syscalls are counted too (Linux).
+
+Run from the repository root:  python benchmarks/bench_file_listing.py [--entries 100000]
+"""
+import argparse
+import os
+import queue
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'examples'))
+
+from file_manager import POLL_MS, SCREENFUL, ListingJob, format_file_size, scan_directory
+
+
+def old_listing(directory):
+    """load_downloads() + show_folder_preview() as they were, minus Tk"""
+    items = []
+    for item_path in directory.iterdir():
+        if item_path.is_dir() and not item_path.name.startswith('.'):
+            items.append((item_path, True))
+    for item_path in directory.iterdir():
+        if item_path.is_file() and not item_path.name.startswith('.'):
+            items.append((item_path, False))
+    items.sort(key=lambda x: (not x[1], x[0].name.lower()))
+    rows = []
+    for item_path, is_dir in items:
+        if is_dir:
+            rows.append(f"📁 {item_path.name:<38} <DIR>")
+        else:
+            size = format_file_size(item_path.stat().st_size)
+            modified = datetime.fromtimestamp(item_path.stat().st_mtime).strftime('%m/%d %H:%M')
+            rows.append(f"📄 {item_path.name:<38} {size:>8} {modified}")
+    files, dirs = [], []
+    for item in directory.iterdir():
+        if item.name.startswith('.'):
+            continue
+        if item.is_dir():
+            dirs.append(item.name)
+        else:
+            files.append(item.name)
+    return rows
+
+
+def new_listing(directory):
+    entries = scan_directory(directory)
+    order = entries.sort_order()
+    for pos in range(min(SCREENFUL, len(order))):
+        entries.cells(order[pos])
+    folder_count = entries.folder_count()
+    entries.names[:folder_count], entries.names[folder_count:]
+    return entries
+
+
+def listbox_lines(entries):
+    """An EntryTable's rows the way the old listbox showed them"""
+    lines = []
+    for i in entries.sort_order():
+        name, size, modified = entries.cells(i)
+        lines.append(f"{name:<40} <DIR>" if entries.is_dir(i) else f"{name:<40} {size:>8} {modified}")
+    return lines
+
+
+LISTINGS = {'old': old_listing, 'new': new_listing}
+
+
+def streamed_listing(directory):
+    """A ListingJob drained every POLL_MS like the Tk loop does; returns the
+    table and the seconds until the first screenful and until the table
+    """
+    start = time.perf_counter()
+    job = ListingJob(directory)
+    job.start()
+    table, first = None, None
+    while True:
+        try:
+            kind, *args = job.messages.get_nowait()
+        except queue.Empty:
+            time.sleep(POLL_MS / 1000)
+            continue
+        if kind in ('first', 'table') and first is None:
+            first = time.perf_counter() - start
+        if kind == 'table':
+            table = args[0]
+        elif kind in ('done', 'error'):
+            return table, first, time.perf_counter() - start
+
+
+def populate(directory, entries, folders_every=50):
+    """`entries` names in `directory`, every `folders_every`th one a folder"""
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(entries):
+        path = directory / f"file {i:06d}.dat"
+        if i % folders_every == 0:
+            path.with_suffix('').mkdir()
+        else:
+            with open(path, 'wb') as f:
+                f.write(b'x' * (i % 4096))
+
+
+class Counter:
+    """Counts filesystem calls made through os while installed"""
+
+    def __init__(self):
+        self.calls = {}
+
+    def count(self, name, fn):
+        def wrapper(*args, **kwargs):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    def scandir(self, fn):
+        counter = self
+
+        class Entry:
+            __slots__ = ('entry',)
+
+            def __init__(self, entry):
+                self.entry = entry
+
+            def __getattr__(self, name):
+                return getattr(self.entry, name)
+
+            def stat(self, **kwargs):
+                counter.calls['DirEntry.stat'] = counter.calls.get('DirEntry.stat', 0) + 1
+                return self.entry.stat(**kwargs)
+
+        class Iterator:
+            def __init__(self, it):
+                self.it = it
+
+            def __iter__(self):
+                return (Entry(entry) for entry in self.it)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self.it.close()
+
+        def wrapper(*args, **kwargs):
+            self.calls['scandir'] = self.calls.get('scandir', 0) + 1
+            return Iterator(fn(*args, **kwargs))
+        return wrapper
+
+    def run(self, fn, *args):
+        saved = os.stat, os.lstat, os.listdir, os.scandir
+        os.stat = self.count('stat', os.stat)
+        os.lstat = self.count('lstat', os.lstat)
+        os.listdir = self.count('listdir', os.listdir)
+        os.scandir = self.scandir(os.scandir)
+        try:
+            fn(*args)
+        finally:
+            os.stat, os.lstat, os.listdir, os.scandir = saved
+        return self.calls
+
+
+def strace_counts(directory, name):
+    """{syscall: calls} for one listing in a fresh interpreter, via strace -c"""
+    code = (f"import sys; sys.path.insert(0, {os.path.dirname(__file__)!r}); "
+            f"from pathlib import Path; import bench_file_listing as b; "
+            f"b.LISTINGS[{name!r}](Path({str(directory)!r}))")
+    with tempfile.NamedTemporaryFile('r', suffix='.txt') as out:
+        subprocess.run(['strace', '-f', '-c', '-o', out.name, '-e', 'trace=%file,%stat,getdents64',
+                        sys.executable, '-c', code], check=True, stdout=subprocess.DEVNULL)
+        counts = {}
+        for line in out.read().splitlines():
+            fields = line.split()
+            # "% time  seconds  usecs/call  calls  [errors]  syscall"
+            if len(fields) >= 5 and fields[0][0].isdigit() and fields[-1] != 'total':
+                counts[fields[-1]] = int(fields[3])
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dir", help="list this directory instead of generating one")
+    args = parser.parse_args(argv)
+
+    tmp = None
+    if args.dir:
+        directory = Path(args.dir)
+    else:
+        tmp = tempfile.mkdtemp(prefix='bench-listing-')
+        directory = Path(tmp) / 'Downloads'
+        start = time.perf_counter()
+        populate(directory, args.entries)
+        print(f"generated {args.entries} entries in {time.perf_counter() - start:.1f}s")
+
+    try:
+        listings = {name: fn(directory) for name, fn in LISTINGS.items()}  # also warms the cache
+        rows_new = listbox_lines(listings['new'])
+        assert listings['old'] == rows_new, "listings differ"
+        print(f"{directory}: {len(rows_new)} rows\n")
+
+        results = {}
+        for name, fn in LISTINGS.items():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                fn(directory)
+                timings.append(time.perf_counter() - start)
+            calls = Counter().run(fn, directory)
+            results[name] = statistics.median(timings), calls
+            detail = ", ".join(f"{k} {v}" for k, v in sorted(calls.items()))
+            print(f"{name:<4} {results[name][0] * 1000:9.1f} ms   {sum(calls.values()):8d} calls  ({detail})")
+
+        (old_time, old_calls), (new_time, new_calls) = results['old'], results['new']
+        print(f"\n{old_time / new_time:.1f}x faster, "
+              f"{sum(old_calls.values()) / max(1, sum(new_calls.values())):.1f}x fewer filesystem calls")
+
+        firsts, totals = [], []
+        for _ in range(args.repeat):
+            table, first, total = streamed_listing(directory)
+            firsts.append(first)
+            totals.append(total)
+        assert listbox_lines(table) == rows_new, "streamed listing differs"
+        print(f"\nin the background (ListingJob): first screenful after "
+              f"{statistics.median(firsts) * 1000:.1f} ms, whole table after "
+              f"{statistics.median(totals) * 1000:.1f} ms (new, synchronous: {new_time * 1000:.1f} ms)")
+
+        if shutil.which('strace'):
+            print("\nsyscalls (strace -c):")
+            for name in LISTINGS:
+                counts = strace_counts(directory, name)
+                detail = ", ".join(f"{k} {v}" for k, v in sorted(counts.items()))
+                print(f"{name:<4} {sum(counts.values()):8d}  ({detail})")
+    finally:
+        if tmp:
+            shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
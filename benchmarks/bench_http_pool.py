@@ -0,0 +1,43 @@
+"""Back-to-back search latency: fresh requests.get per search vs. the pooled session
+
+Run from the repository root:  python benchmarks/bench_http_pool.py
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+import requests
+
+import wiki_http
+from mock_api import MockApiServer
+
+N = 200
+
+
+def run(label, fetch):
+    timings = []
+    for i in range(N):
+        start = time.perf_counter()
+        fetch({'action': 'opensearch', 'search': f'query{i}', 'limit': 10, 'format': 'json'})
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<16} mean {statistics.mean(timings):6.3f} ms   "
+          f"p50 {statistics.median(timings):6.3f} ms   total {sum(timings):8.1f} ms")
+    return statistics.mean(timings)
+
+
+def main():
+    # Measure connection reuse, not the rate limiter
+    wiki_http.configure(wiki_http.HttpClientConfig(requests_per_second=1e6, burst=1e6))
+    with MockApiServer() as url:
+        cold = run("requests.get", lambda p: requests.get(
+            url, params=p, headers=wiki_http.DEFAULT_HEADERS, timeout=15).json())
+        warm = run("pooled session", lambda p: wiki_http.api_get(p, url=url).json())
+        wiki_http.close_session()
+    print(f"speedup: {cold / warm:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
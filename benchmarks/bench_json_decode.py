@@ -0,0 +1,131 @@
+"""Decoding large opensearch and list=search responses with each JSON backend
+
+Compares the stdlib path the app used before (json.loads, then walking
+the decoded arrays) with parse_opensearch/parse_search_page on every
+backend json_decode can load here. The payloads are shaped like real
+responses: non-ASCII titles, HTML snippets with searchmatch spans and
+entities, and the extra fields list=search returns by default. Saved
+responses can be used instead:
+
+    curl -o search.json 'https://en.wikipedia.org/w/api.php?action=query&list=search&srsearch=python&srlimit=500&format=json'
+    python benchmarks/bench_json_decode.py --search-page search.json
+
+Run from the repository root:  python benchmarks/bench_json_decode.py [--rows 500]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+import json_decode
+import wiki_api
+from results import ResultSet, NO_DESCRIPTION
+
+WORDS = ("Python", "Zürich", "Ελληνικά", "東京", "São Paulo", "Łódź", "Reykjavík", "Dvořák")
+
+
+class Response:
+    """Just what the parse functions read from a requests.Response"""
+    status_code = 200
+    headers = {}
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+def opensearch_body(rows):
+    titles = [f"{WORDS[i % len(WORDS)]} {i} (disambiguation)" for i in range(rows)]
+    descriptions = [f"{t} is a topic described in about a sentence and a half, "
+                    f"as Wikidata short descriptions tend to be." for t in titles]
+    urls = [f"https://en.wikipedia.org/wiki/{t.replace(' ', '_')}" for t in titles]
+    return json.dumps(["python", titles, descriptions, urls], ensure_ascii=False).encode()
+
+
+def search_page_body(rows):
+    hits = [{
+        'ns': 0,
+        'title': f"{WORDS[i % len(WORDS)]} {i}",
+        'pageid': 1000 + i,
+        'size': 20000 + i,
+        'wordcount': 3000 + i,
+        'snippet': (f'The <span class="searchmatch">{WORDS[i % len(WORDS)]}</span> article '
+                    f'&quot;{i}&quot; covers history, geography &amp; culture in some detail'),
+        'timestamp': "2024-05-01T12:00:00Z",
+    } for i in range(rows)]
+    payload = {
+        'batchcomplete': '',
+        'continue': {'sroffset': rows, 'continue': '-||'},
+        'query': {'searchinfo': {'totalhits': rows * 10}, 'search': hits},
+    }
+    return json.dumps(payload, ensure_ascii=False).encode()
+
+
+# The parsing code as it was before json_decode, for reference
+
+def stdlib_opensearch(response):
+    data = json.loads(response.content)
+    return ResultSet(data[1], data[2])
+
+
+def stdlib_search_page(response):
+    data = json.loads(response.content)
+    hits = data['query'].get('search', [])
+    articles = ResultSet([hit.get('title', '') for hit in hits],
+                         [wiki_api.html.unescape(wiki_api._TAG_RE.sub("", hit.get('snippet') or "")).strip()
+                          or NO_DESCRIPTION for hit in hits])
+    return articles, data.get('continue', {}).get('sroffset'), \
+        data['query'].get('searchinfo', {}).get('totalhits', len(articles))
+
+
+def median_ms(fn, response, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(response)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500, help="results per generated payload")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--opensearch", metavar="FILE", help="saved opensearch response to decode")
+    parser.add_argument("--search-page", metavar="FILE", help="saved list=search response to decode")
+    args = parser.parse_args(argv)
+
+    payloads = []
+    for label, path, generate, baseline, parse in (
+            ("opensearch", args.opensearch, opensearch_body,
+             stdlib_opensearch, wiki_api.parse_opensearch),
+            ("list=search", args.search_page, search_page_body,
+             stdlib_search_page, wiki_api.parse_search_page)):
+        if path:
+            with open(path, 'rb') as f:
+                body = f.read()
+        else:
+            body = generate(args.rows)
+        payloads.append((label, Response(body), baseline, parse))
+
+    backends = json_decode.available_backends()
+    print(f"backends available: {', '.join(backends)}")
+    for label, response, baseline, parse in payloads:
+        print(f"\n{label} ({len(response.content) / 1024:.0f} KiB)")
+        reference = median_ms(baseline, response, args.repeat)
+        print(f"    {'before (json + walk)':<22} {reference:8.3f} ms")
+        for name in backends:
+            json_decode.set_backend(name)
+            elapsed = median_ms(parse, response, args.repeat)
+            print(f"    {name:<22} {elapsed:8.3f} ms  {reference / elapsed:5.1f}x")
+    json_decode.set_backend()
+
+
+if __name__ == "__main__":
+    main()
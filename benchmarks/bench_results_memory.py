@@ -0,0 +1,63 @@
+"""Memory held by 100k search results: one dict per article vs. ResultSet
+
+Both are built from the same decoded opensearch arrays, the way
+parse_opensearch sees them; the decoded JSON is dropped afterwards, so what
+is measured is what the results keep alive.
+
+Run from the repository root:  python benchmarks/bench_results_memory.py [--rows 100000]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+from mock_api import opensearch_payload
+from results import ResultSet
+
+
+def as_dicts(data):
+    """The previous representation: a dict per article, URL stored"""
+    titles, descriptions, urls = data[1], data[2], data[3]
+    return [{'title': title, 'description': descriptions[i], 'url': urls[i]}
+            for i, title in enumerate(titles)]
+
+
+def as_result_set(data):
+    return ResultSet(data[1], data[2])
+
+
+def measure(label, build, payload):
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(payload)
+    start = time.perf_counter()
+    results = build(data)
+    elapsed = (time.perf_counter() - start) * 1000
+    del data
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} retained {retained / 1e6:7.1f} MB   peak {peak / 1e6:7.1f} MB   "
+          f"build {elapsed:7.1f} ms")
+    del results
+    return retained
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    payload = json.dumps(opensearch_payload("Memory benchmark", args.rows, description_size=40))
+    before = measure("dicts", as_dicts, payload)
+    after = measure("ResultSet", as_result_set, payload)
+    print(f"{before / after:.1f}x less memory for {args.rows:,} results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Cold start: import time of the GUI module and launch to first painted window
+
+Every run uses a fresh interpreter and an empty cache directory; first
+paint is also measured with a cache holding a title index of
+POPULATED_TITLES titles, as a long-time user's would. Exits with status 1
+when the median of any measurement is over its budget.
+
+Run from the repository root:  python benchmarks/bench_startup.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+SRC = os.path.join(ROOT, 'src')
+sys.path.insert(0, SRC)
+
+import app_paths
+from results import ResultSet
+from title_index import TitleIndex
+
+# Budgets in milliseconds; raise them deliberately, not to make a regression pass
+IMPORT_BUDGET_MS = 220
+FIRST_PAINT_BUDGET_MS = 400
+
+POPULATED_TITLES = 300_000
+
+# Mirrors app.main() and exits at the window's first paint event
+FIRST_PAINT_SCRIPT = """
+import sys
+import app
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            print("painted", flush=True)
+            QApplication.instance().exit(0)
+        return False
+
+
+qt_app = QApplication(sys.argv[:1])
+qt_app.setStyleSheet(app.STYLESHEET)
+window = app.WikipediaSearchGUI()
+first_paint = FirstPaint()
+window.installEventFilter(first_paint)
+window.show()
+qt_app.exec()
+window.search_engine.stop()
+"""
+
+
+def _env(cache):
+    env = dict(os.environ, XDG_CACHE_HOME=cache)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def measure_import(cache):
+    """(cumulative ms for `import app`, [(self ms, module)] of its slowest imports)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                            cwd=SRC, env=_env(cache), capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us) / 1000, int(cumulative_us) / 1000, name.strip()))
+    # Everything after the interpreter's own site imports belongs to `import app`
+    site = max(i for i, row in enumerate(rows) if row[2] == "site")
+    app_rows = rows[site + 1:]
+    slowest = sorted(((ms, name) for ms, _, name in app_rows), reverse=True)[:8]
+    return app_rows[-1][1], slowest
+
+
+def measure_first_paint(cache):
+    """Milliseconds from starting the interpreter to the window's first paint"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", FIRST_PAINT_SCRIPT], cwd=SRC,
+                            env=_env(cache), stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    elapsed = (time.perf_counter() - start) * 1000
+    proc.wait(timeout=30)
+    if line.strip() != "painted":
+        raise RuntimeError("window was never painted")
+    return elapsed
+
+
+def populate_cache(cache, titles=POPULATED_TITLES):
+    """Give the cache directory a title index of `titles` titles"""
+    directory = os.path.join(cache, app_paths.APP_NAME)
+    os.makedirs(directory, exist_ok=True)
+    names = [f"Article {i:07d}" for i in range(titles)]
+    index = TitleIndex(os.path.join(directory, "title_index.txt"))
+    index.add(ResultSet(names, [f"Description of {name}" for name in names]))
+    index.save()
+
+
+def run(runs):
+    """Median import and first-paint times over `runs` fresh interpreters"""
+    imports, paints, populated = [], [], []
+    with tempfile.TemporaryDirectory() as populated_cache:
+        populate_cache(populated_cache)
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as cache:
+                import_ms, slowest = measure_import(cache)
+                imports.append(import_ms)
+                paints.append(measure_first_paint(cache))
+            populated.append(measure_first_paint(populated_cache))
+    return {
+        'import_ms': statistics.median(imports),
+        'first_paint_ms': statistics.median(paints),
+        'first_paint_populated_ms': statistics.median(populated),
+    }, slowest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--paint-budget-ms", type=float, default=FIRST_PAINT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    results, slowest = run(args.runs)
+    print("slowest imports under `import app` (self time):")
+    for ms, name in slowest:
+        print(f"    {ms:7.1f} ms  {name}")
+    failed = False
+    checks = (
+        ("import app", results['import_ms'], args.import_budget_ms),
+        ("first paint", results['first_paint_ms'], args.paint_budget_ms),
+        (f"first paint, {POPULATED_TITLES // 1000}k titles cached",
+         results['first_paint_populated_ms'], args.paint_budget_ms),
+    )
+    for label, value, budget in checks:
+        over = value > budget
+        failed |= over
+        print(f"{label:<34} {value:8.1f} ms  (budget {budget:.0f} ms){'  OVER BUDGET' if over else ''}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
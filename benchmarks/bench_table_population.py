@@ -0,0 +1,86 @@
+"""Time filling the results table with 10k rows: QTableWidget + per-row
+QPushButton (the previous display_results) vs. ResultsTableModel + delegate
+
+Run from the repository root:  QT_QPA_PLATFORM=offscreen python benchmarks/bench_table_population.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QPushButton, QTableView, QTableWidget, QTableWidgetItem
+
+from results import ResultSet
+from results_model import LinkButtonDelegate, ResultsTableModel
+
+ROWS = 10_000
+BUTTON_STYLE = """
+    QPushButton {
+        background-color: #3498DB;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 5px;
+    }
+    QPushButton:hover {
+        background-color: #2980B9;
+    }
+"""
+
+
+def make_articles(n):
+    return [{'title': f"Article {i}", 'description': f"Description of article {i}",
+             'url': f"https://en.wikipedia.org/wiki/Article_{i}"} for i in range(n)]
+
+
+def populate_widget(table, articles):
+    table.setRowCount(len(articles))
+    for i, article in enumerate(articles):
+        title_item = QTableWidgetItem(article['title'])
+        title_item.setFlags(title_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        table.setItem(i, 0, title_item)
+        desc_item = QTableWidgetItem(article['description'])
+        desc_item.setFlags(desc_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        table.setItem(i, 1, desc_item)
+        button = QPushButton("🔗 Open")
+        button.setStyleSheet(BUTTON_STYLE)
+        button.clicked.connect(lambda checked, u=article['url']: None)
+        table.setCellWidget(i, 2, button)
+
+
+def timed(label, fn, app):
+    start = time.perf_counter()
+    fn()
+    app.processEvents()  # include the first paint
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed * 1000:10.1f} ms")
+    return elapsed
+
+
+def main():
+    app = QApplication(sys.argv)
+    articles = make_articles(ROWS)
+
+    widget = QTableWidget()
+    widget.setColumnCount(3)
+    widget.resize(800, 600)
+    widget.show()
+    before = timed("QTableWidget", lambda: populate_widget(widget, articles), app)
+    widget.close()
+
+    model = ResultsTableModel()
+    view = QTableView()
+    view.setModel(model)
+    view.setItemDelegateForColumn(ResultsTableModel.LINK, LinkButtonDelegate(view))
+    view.resize(800, 600)
+    view.show()
+    after = timed("ResultsTableModel", lambda: model.set_articles(ResultSet.from_dicts(articles)), app)
+
+    print(f"speedup: {before / after:.1f}x for {ROWS} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Preview thumbnails in the file manager example: before and after
+
+Before, show_preview opened the full image and ran a LANCZOS thumbnail()
+on the Tk thread every time a photo was selected. Now make_thumbnail runs
+in a process pool, decodes JPEGs at reduced scale with Image.draft and
+leaves a small PNG in the on-disk cache, which later selections load.
+The cache hit is timed by decoding that PNG with PIL (the app hands it
+to tk.PhotoImage, which needs a display).
+
+Pillow 7+ already drafts JPEGs inside thumbnail(), so a first-time
+thumbnail costs about the same as before; what changes is that it no
+longer runs on the UI thread and that it is only ever made once.
+
+Run from the repository root:  python benchmarks/bench_thumbnails.py [--photos 8]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'examples'))
+
+from PIL import Image
+
+from file_manager import THUMB_SIZE, make_thumbnail
+
+
+def make_photos(directory, count, size):
+    """`count` noisy JPEGs, so they compress like photographs"""
+    paths = []
+    noise = Image.effect_noise(size, 64).convert('RGB')
+    for i in range(count):
+        path = os.path.join(directory, f"IMG_{i:04d}.jpg")
+        Image.blend(noise, Image.new('RGB', size, (40 * i % 255, 90, 160)), 0.5).save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def old_preview(path):
+    image = Image.open(path)
+    image.thumbnail(THUMB_SIZE, Image.Resampling.LANCZOS)
+    return image
+
+
+def cache_hit(cache_file):
+    with Image.open(cache_file) as image:
+        image.load()
+
+
+def median_ms(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--photos", type=int, default=8)
+    parser.add_argument("--width", type=int, default=6000)
+    parser.add_argument("--height", type=int, default=4000)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix='bench-thumbs-')
+    try:
+        paths = make_photos(tmp, args.photos, (args.width, args.height))
+        cache = [os.path.join(tmp, f"thumb{i}.png") for i in range(len(paths))]
+        print(f"{len(paths)} JPEGs, {args.width}x{args.height}, "
+              f"{os.path.getsize(paths[0]) / 2**20:.1f} MiB each\n")
+
+        old = median_ms(old_preview, [(p,) for p in paths])
+        new = median_ms(make_thumbnail, list(zip(paths, cache)))
+        hit = median_ms(cache_hit, [(c,) for c in cache])
+        print(f"{'before: open + thumbnail() on the UI thread':<46} {old:8.1f} ms")
+        print(f"{'make_thumbnail (draft), in a worker':<46} {new:8.1f} ms  {old / new:5.1f}x")
+        print(f"{'cached thumbnail':<46} {hit:8.1f} ms  {old / hit:5.1f}x")
+
+        for c in cache:
+            os.remove(c)
+        with ProcessPoolExecutor(args.workers) as pool:
+            pool.submit(int).result()  # workers up before timing
+            start = time.perf_counter()
+            list(pool.map(make_thumbnail, paths, cache))
+            elapsed = time.perf_counter() - start
+        print(f"\nall {len(paths)} in a pool of {args.workers}: {elapsed * 1000:.0f} ms "
+              f"(before, one after another: {old * len(paths):.0f} ms)")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""PyInstaller runtime hook for bench_bundle.py builds only.
+
+Prints "painted" at the main window's first paint event and quits, so the
+launch-to-window time of a bundle can be timed from outside.
+"""
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication, QMainWindow
+
+
+class _FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            print("painted", flush=True)
+            QApplication.instance().exit(0)
+        return False
+
+
+_show = QMainWindow.show
+
+
+def _show_and_watch(window):
+    window._first_paint = _FirstPaint(window)
+    window.installEventFilter(window._first_paint)
+    _show(window)
+
+
+QMainWindow.show = _show_and_watch
@@ -0,0 +1,127 @@
+"""Local stand-in for https://en.wikipedia.org/w/api.php used by the benchmarks"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def opensearch_payload(query, limit, description_size=0):
+    titles = [f"{query} {i}" for i in range(limit)]
+    padding = "x" * description_size
+    descriptions = [f"Description of {t} {padding}".rstrip() for t in titles]
+    urls = [f"https://en.wikipedia.org/wiki/{t.replace(' ', '_')}" for t in titles]
+    return [query, titles, descriptions, urls]
+
+
+def search_payload(query, offset, limit, total_hits):
+    """action=query&list=search page with a continuation token while hits remain"""
+    end = min(offset + limit, total_hits)
+    payload = {
+        'batchcomplete': '',
+        'query': {
+            'searchinfo': {'totalhits': total_hits},
+            'search': [
+                {'ns': 0, 'title': f"{query} {i}", 'pageid': i,
+                 'snippet': f'<span class="searchmatch">{query}</span> result {i}'}
+                for i in range(offset, end)
+            ],
+        },
+    }
+    if end < total_hits:
+        payload['continue'] = {'sroffset': end, 'continue': '-||'}
+    return payload
+
+
+def summaries_payload(titles):
+    """prop=extracts|pageimages answer (formatversion=2) for '|'-joined titles"""
+    pages = [{'pageid': i, 'ns': 0, 'title': title, 'extract': f"{title} is an article."}
+             for i, title in enumerate(titles.split('|'))]
+    return {'batchcomplete': True, 'query': {'pages': pages}}
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    # Headers and body go out in separate sends; with Nagle on, the client's
+    # delayed ACK holds every keep-alive response back by ~40 ms
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.should_throttle():
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if 'extracts' in params.get('prop', ''):
+            payload = summaries_payload(params.get('titles', ''))
+        elif params.get('list') == 'search':
+            payload = search_payload(params.get('srsearch', ''), int(params.get('sroffset', 0)),
+                                     int(params.get('srlimit', 10)), self.server.total_hits)
+        else:
+            payload = opensearch_payload(params.get('search', ''), int(params.get('limit', 10)),
+                                         self.server.description_size)
+        body = json.dumps(payload).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    requests = 0
+    throttled = 0
+
+    def should_throttle(self):
+        """Answer every `throttle_every`-th request with 429 (Retry-After: 0)"""
+        with self.counter_lock:
+            self.requests += 1
+            throttle = bool(self.throttle_every) and self.requests % self.throttle_every == 0
+            self.throttled += throttle
+        return throttle
+
+
+class MockApiServer:
+    """Run the mock API on a background thread: `with MockApiServer() as url: ...`
+
+    `latency` is added to every response (seconds), `description_size` pads
+    each opensearch description to grow the payload, and `throttle_every`
+    rejects every n-th request with HTTP 429 to exercise the retry path.
+    """
+
+    def __init__(self, latency=0.0, total_hits=1000, description_size=0, throttle_every=0,
+                 handler=MockApiHandler):
+        self.httpd = _MockHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.latency = latency
+        self.httpd.total_hits = total_hits  # size of list=search result sets
+        self.httpd.description_size = description_size
+        self.httpd.throttle_every = throttle_every
+        self.httpd.counter_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def stats(self):
+        return {'requests': self.httpd.requests, 'throttled': self.httpd.throttled}
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/w/api.php"
+
+    def __enter__(self):
+        self.thread.start()
+        return self.url
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
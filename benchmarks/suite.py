@@ -0,0 +1,367 @@
+"""Benchmark suite for the search pipeline against the local mock API
+
+Measures end-to-end searches/sec under several server scenarios (latency,
+payload size, injected 429s), federated searches over several mock wikis,
+response parsing, the search cache's hit
+paths, results table population for 10/1k/10k rows with offscreen Qt
+rendering, and cold start (see bench_startup.py). Results are written as
+JSON so runs can be compared across commits.
+
+Run from the repository root:
+
+    python benchmarks/suite.py                          # writes benchmarks/results/<commit>.json
+    python benchmarks/suite.py --quick --only table
+    python benchmarks/suite.py --compare benchmarks/results/<old commit>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import json_decode
+import wiki_api
+import wiki_http
+from mock_api import MockApiServer
+from results import ResultSet
+from search_cache import SearchCache
+from search_engine import SearchEngine
+from search_metrics import MetricsRecorder, SearchTiming, percentile
+from wikis import parse_wikis
+
+# name -> MockApiServer keyword arguments
+SCENARIOS = {
+    'baseline': {},
+    'latency_20ms': {'latency': 0.02},
+    'payload_2kb': {'description_size': 2000},
+    'throttle_5pct': {'throttle_every': 20},
+}
+TABLE_SIZES = (10, 1_000, 10_000)
+PARSE_SIZES = (10, 100, 500)
+
+
+def median_ms(fn, repeat):
+    """Median wall time of `fn()` over `repeat` runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def make_articles(n, prefix="Article"):
+    return ResultSet([f"{prefix} {i}" for i in range(n)],
+                     [f"Description of {prefix.lower()} {i}" for i in range(n)])
+
+
+def use_mock(url, concurrency=10):
+    # Measure the pipeline, not the politeness limit towards Wikipedia
+    wiki_http.configure(wiki_http.HttpClientConfig(
+        requests_per_second=1e6, burst=1e6, pool_maxsize=concurrency, api_url=url))
+
+
+# End-to-end searches through the SearchEngine
+
+async def _search_all(engine, queries, concurrency, recorder):
+    latencies = []
+    errors = 0
+    window = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        nonlocal errors
+        async with window:
+            timing = SearchTiming(query)
+            try:
+                await engine.opensearch(query, 10, 0, timing)
+            except Exception:
+                errors += 1
+                return
+            latencies.append(timing.finish().phases['total'])
+            recorder.record(timing)
+
+    await asyncio.gather(*(one(q) for q in queries))
+    return latencies, errors
+
+
+def bench_end_to_end(options):
+    results = {}
+    for name, server_options in SCENARIOS.items():
+        server = MockApiServer(**server_options)
+        with server as url:
+            use_mock(url, options.concurrency)
+            engine = SearchEngine(max_concurrency=options.concurrency)
+            recorder = MetricsRecorder(size=options.searches)
+            queries = [f"{name} query {i}" for i in range(options.searches)]
+            start = time.perf_counter()
+            try:
+                latencies, errors = asyncio.run(
+                    _search_all(engine, queries, options.concurrency, recorder))
+            finally:
+                engine.stop()
+                wiki_http.close_session()
+            elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        phases = recorder.aggregates()
+        results[name] = {
+            'searches_per_second': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'ttfb_p50_ms': phases['ttfb']['p50'],
+            'parse_p50_ms': phases['parse']['p50'],
+            'errors': errors,
+            'throttled': server.stats['throttled'],
+        }
+    return results
+
+
+# Federated search: one query fanned out to several wikis at once
+
+FEDERATED_LATENCIES = {'fast': 0.01, 'medium': 0.03, 'slow': 0.06}
+
+
+def bench_federated(options):
+    servers = {name: MockApiServer(latency=latency) for name, latency in FEDERATED_LATENCIES.items()}
+    urls = {name: server.__enter__() for name, server in servers.items()}
+    searches = max(1, options.searches // 20)
+    try:
+        use_mock(urls['fast'], options.concurrency)
+        wikis = parse_wikis([f"{name}={url}" for name, url in urls.items()])
+        engine = SearchEngine(max_concurrency=options.concurrency)
+        recorder = MetricsRecorder(size=searches * len(wikis))
+
+        async def run_all():
+            totals = []
+            for i in range(searches):
+                start = time.perf_counter()
+                for wiki, articles, error, timing in await engine.federated(f"federated {i}", wikis):
+                    recorder.record(timing)
+                totals.append((time.perf_counter() - start) * 1000)
+            return totals
+
+        try:
+            totals = sorted(asyncio.run(run_all()))
+        finally:
+            engine.stop()
+            wiki_http.close_session()
+    finally:
+        for server in servers.values():
+            server.__exit__(None, None, None)
+
+    endpoints = recorder.endpoints()
+    results = {
+        # All wikis answered: bounded by the slowest one, not their sum
+        'all_wikis_p50_ms': percentile(totals, 50),
+        'sum_of_endpoints_p50_ms': sum(stats['p50'] for stats in endpoints.values()),
+    }
+    for name, stats in endpoints.items():
+        results[f"{name}_p50_ms"] = stats['p50']
+    return results
+
+
+# Response parsing
+
+def bench_parse(options):
+    results = {}
+    with MockApiServer(description_size=200) as url:
+        use_mock(url)
+        try:
+            for size in PARSE_SIZES:
+                response = wiki_http.api_get(wiki_api.opensearch_params("parse", size))
+                response.content  # read the body once, outside the timed loop
+                results[f"opensearch_{size}_ms"] = median_ms(
+                    lambda: wiki_api.parse_opensearch(response), options.repeat * 10)
+                response = wiki_http.api_get(wiki_api.search_page_params("parse", 0, size))
+                response.content
+                results[f"search_page_{size}_ms"] = median_ms(
+                    lambda: wiki_api.parse_search_page(response), options.repeat * 10)
+        finally:
+            wiki_http.close_session()
+    return results
+
+
+# Search cache hit paths
+
+def bench_cache(options):
+    entries = 200
+    articles = make_articles(20)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "cache.sqlite3")
+        cache = SearchCache(db_path)
+        start = time.perf_counter()
+        for i in range(entries):
+            cache.put(f"query {i}", 20, articles)
+        put_ms = (time.perf_counter() - start) * 1000 / entries
+
+        def lookup_all(c, prefix="query"):
+            for i in range(entries):
+                c.get(f"{prefix} {i}", 10)
+
+        memory_ms = median_ms(lambda: lookup_all(cache), options.repeat) / entries
+        miss_ms = median_ms(lambda: lookup_all(cache, "missing"), options.repeat) / entries
+        cache.close()
+
+        # A fresh instance has an empty memory tier, so every first lookup hits SQLite
+        disk_ms = []
+        for _ in range(options.repeat):
+            cold = SearchCache(db_path)
+            disk_ms.append(median_ms(lambda: lookup_all(cold), 1) / entries)
+            cold.close()
+    return {
+        'put_ms': put_ms,
+        'memory_hit_ms': memory_ms,
+        'disk_hit_ms': statistics.median(disk_ms),
+        'miss_ms': miss_ms,
+    }
+
+
+# Results table population, offscreen
+
+def bench_table(options):
+    from PyQt6.QtWidgets import QApplication, QTableView
+    from results_model import LinkButtonDelegate, ResultsTableModel
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {}
+    for size in TABLE_SIZES:
+        model = ResultsTableModel()
+        view = QTableView()
+        view.setModel(model)
+        view.setItemDelegateForColumn(ResultsTableModel.LINK, LinkButtonDelegate(view))
+        view.resize(800, 600)
+        view.show()
+        first = make_articles(size)
+        # Refining a query: half the rows stay, half are new
+        refined = first[:size // 2]
+        refined.extend(make_articles(size - size // 2, "Other"))
+
+        def populate(articles, update=False):
+            # The model edits what it is given, so every run gets fresh copies
+            model.set_articles(first.copy() if update else ResultSet())
+            articles = articles.copy()
+            app.processEvents()
+            start = time.perf_counter()
+            if update:
+                model.update_articles(articles)
+            else:
+                model.set_articles(articles)
+            view.viewport().repaint()  # include painting the visible rows
+            app.processEvents()
+            return (time.perf_counter() - start) * 1000
+
+        results[f"set_{size}_ms"] = statistics.median(populate(first) for _ in range(options.repeat))
+        results[f"update_{size}_ms"] = statistics.median(
+            populate(refined, update=True) for _ in range(options.repeat))
+        view.close()
+    return results
+
+
+# Cold start, in fresh interpreters
+
+def bench_startup(options):
+    import bench_startup
+    results, _ = bench_startup.run(options.repeat)
+    return results
+
+
+BENCHMARKS = {
+    'end_to_end': bench_end_to_end,
+    'federated': bench_federated,
+    'parse': bench_parse,
+    'cache': bench_cache,
+    'table': bench_table,
+    'startup': bench_startup,
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(results, prefix=""):
+    """{'a': {'b': 1}} -> {'a.b': 1}"""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(baseline, current):
+    """Print every metric next to its baseline value"""
+    old_metrics = flatten(baseline['results'])
+    print(f"\n{'metric':<48} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for metric, value in flatten(current['results']).items():
+        old = old_metrics.get(metric)
+        if old is None:
+            continue
+        ratio = f"{value / old:7.2f}x" if old else "      -"
+        print(f"{metric:<48} {old:12.3f} {value:12.3f} {ratio:>8}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", choices=BENCHMARKS, action="append",
+                        help="run only these benchmarks (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="fewer searches and repeats")
+    parser.add_argument("--searches", type=int, default=1000, help="searches per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    options = parser.parse_args(argv)
+    if options.quick:
+        options.searches = min(options.searches, 200)
+        options.repeat = min(options.repeat, 2)
+    return options
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'json_backend': json_decode.backend(),
+        'options': {k: v for k, v in vars(options).items() if k not in ('output', 'compare')},
+        'results': {},
+    }
+    for name in options.only or BENCHMARKS:
+        start = time.perf_counter()
+        report['results'][name] = BENCHMARKS[name](options)
+        print(f"{name:<12} done in {time.perf_counter() - start:5.1f}s")
+        for metric, value in flatten(report['results'][name]).items():
+            print(f"    {metric:<40} {value:12.3f}")
+
+    output = options.output or os.path.join(ROOT, "benchmarks", "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}")
+
+    if options.compare:
+        with open(options.compare, encoding='utf-8') as f:
+            compare(json.load(f), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
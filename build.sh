@@ -1,7 +1,5 @@
 #!/bin/bash
-pyinstaller --name="WikiSearch" \
-            --windowed \
-            --onefile \
-            --add-data "src:src" \
-            --icon="src/icon.icns" \
-            src/app.py
\ No newline at end of file
+# One-folder build (dist/WikiSearch/, or dist/WikiSearch.app on macOS): nothing
+# is unpacked at launch. For the old single-file build use
+#   pyinstaller --noconfirm WikiSearch.spec -- --profile legacy
+pyinstaller --noconfirm WikiSearch.spec
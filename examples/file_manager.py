@@ -1,21 +1,877 @@
+import ctypes
+import hashlib
+import multiprocessing
 import os
+import queue
+import select
 import shutil
+import struct
+import sys
+import threading
+import time
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import filedialog, messagebox, simpledialog, ttk
 from send2trash import send2trash
 import subprocess
 import platform
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
+from stat import S_ISDIR, S_ISREG
 from datetime import datetime
 
+# Background listing: rows shown before the rest of the folder is read,
+# entries between progress messages, how often/long the Tk loop drains the queue
+SCREENFUL = 64
+ROW_BATCH = 2000
+POLL_MS = 15
+POLL_BUDGET = 0.03
+
+# Directory watching: how long to gather events before applying them, the
+# polling fallback's shortest interval, and how often the Tk loop checks in
+WATCH_DELAY = 0.1
+WATCH_INTERVAL = 1.0
+WATCH_POLL_MS = 100
+
+# Preview thumbnails: largest size, image types, PhotoImages kept in memory,
+# and files on each side of the selection made ahead of time
+THUMB_SIZE = (250, 160)
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+THUMB_MEMORY = 64
+PREFETCH = 3
+
+
+def format_file_size(size):
+    """Format file size in human readable format"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f}{unit}"
+        size /= 1024.0
+    return f"{size:.1f}TB"
+
+
+@lru_cache(maxsize=4096)
+def _minute_label(minute):
+    # Files saved together share a label; strftime is most of a row's cost
+    return datetime.fromtimestamp(minute * 60).strftime('%m/%d %H:%M')
+
+
+# EntryTable.dirs values; removed rows keep their index until the next listing
+FILE, FOLDER, REMOVED = 0, 1, 2
+
+
+class EntryTable:
+    """A directory listing as parallel columns: folders first, then files,
+    each by case-insensitive name. Paths are only built when asked for.
+    
+    Rows can be appended, updated and removed later; removal only marks
+    the row, so row indices held elsewhere stay valid.
+    """
+    
+    __slots__ = ('directory', 'names', 'dirs', 'sizes', 'mtimes', 'name_sorted', 'removed', 'rows')
+    
+    def __init__(self, directory, folders=(), files=()):
+        self.directory = Path(directory)
+        self.names = list(folders)
+        self.dirs = bytearray(b'\x01') * len(self.names)
+        self.sizes = array('q', bytes(8 * len(self.names)))
+        self.mtimes = array('d', bytes(8 * len(self.names)))
+        self.removed = 0
+        self.rows = None
+        for name, size, mtime in files:
+            self.append(name, False, size, mtime)
+        self.name_sorted = True
+    
+    def __len__(self):
+        return len(self.names) - self.removed
+    
+    def append(self, name, is_dir, size=0, mtime=0.0):
+        """Add a row and return its index; `name` may also be an absolute
+        path outside the directory
+        """
+        if self.rows is not None:
+            self.rows[name] = len(self.names)
+        self.names.append(name)
+        self.dirs.append(FOLDER if is_dir else FILE)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.name_sorted = False
+        return len(self.names) - 1
+    
+    def update(self, i, is_dir, size, mtime):
+        self.dirs[i] = FOLDER if is_dir else FILE
+        self.sizes[i] = size
+        self.mtimes[i] = mtime
+    
+    def remove(self, i):
+        if self.rows is not None:
+            self.rows.pop(self.names[i], None)
+        self.dirs[i] = REMOVED
+        self.removed += 1
+    
+    def find(self, name):
+        """Index of the row called `name`, or None"""
+        if self.rows is None:
+            # Built on first use: only tables that receive changes need it
+            dirs = self.dirs
+            self.rows = {name: i for i, name in enumerate(self.names) if dirs[i] != REMOVED}
+        return self.rows.get(name)
+    
+    def info(self, i):
+        """(is_dir, size, mtime) of row i, as stat_entry() reports them"""
+        return self.dirs[i] == FOLDER, self.sizes[i], self.mtimes[i]
+    
+    def path(self, i):
+        return self.directory / self.names[i]
+    
+    def paths(self):
+        dirs = self.dirs
+        return [self.directory / name for i, name in enumerate(self.names) if dirs[i] != REMOVED]
+    
+    def is_dir(self, i):
+        return self.dirs[i] == FOLDER
+    
+    def folder_count(self):
+        return self.dirs.count(FOLDER)
+    
+    def cells(self, i):
+        """(name, size, modified) as the file list shows row i"""
+        name = os.path.basename(self.names[i])
+        if self.dirs[i] == FOLDER:
+            return f"📁 {name}", "<DIR>", ""
+        return f"📄 {name}", format_file_size(self.sizes[i]), _minute_label(int(self.mtimes[i] // 60))
+    
+    def sort_order(self, column='name', reverse=False):
+        """Row indices in display order: folders first, then by `column`.
+        
+        Sorts the size/mtime arrays or lowercased names, never Paths; a
+        freshly scanned table is already in ascending name order.
+        """
+        count = len(self.names)
+        dirs = self.dirs
+        if column == 'name' and not reverse and self.name_sorted:
+            if not self.removed:
+                return array('l', range(count))
+            return array('l', [i for i in range(count) if dirs[i] != REMOVED])
+        if column == 'name':
+            keys = [os.path.basename(name).lower() for name in self.names]
+        else:
+            keys = self.sizes if column == 'size' else self.mtimes
+        rows = sorted(range(count), key=keys.__getitem__, reverse=reverse)
+        order = array('l', [i for i in rows if dirs[i] == FOLDER])
+        order.extend([i for i in rows if dirs[i] == FILE])
+        return order
+    
+    def row_key(self, i, column):
+        """What sort_order() sorts row i by for `column`"""
+        if column == 'size':
+            return self.sizes[i]
+        if column == 'mtime':
+            return self.mtimes[i]
+        return os.path.basename(self.names[i]).lower()
+
+
+def scan_directory(directory, stat=True, progress=None, every=SCREENFUL):
+    """List `directory` in a single os.scandir pass, skipping hidden entries.
+
+    DirEntry.is_dir()/is_file() are answered from the directory read itself
+    on most filesystems and entry.stat() costs one syscall per file at most
+    (none on Windows). With stat=False only names and types are collected.
+    progress(folders, files) is called every `every` entries read; it may
+    raise to abandon the scan.
+    """
+    folders, files = [], []
+    seen = 0
+    with os.scandir(directory) as it:
+        for entry in it:
+            seen += 1
+            if progress is not None and seen % every == 0:
+                progress(folders, files)
+            name = entry.name
+            if name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir():
+                    folders.append(name)
+                elif entry.is_file():
+                    if stat:
+                        st = entry.stat()
+                        files.append((name, st.st_size, st.st_mtime))
+                    else:
+                        files.append((name, 0, 0.0))
+            except OSError:
+                # Removed or unreadable since the directory was read
+                continue
+    folders.sort(key=str.lower)
+    files.sort(key=lambda f: f[0].lower())
+    return EntryTable(directory, folders, files)
+
+
+class ListingCancelled(Exception):
+    pass
+
+
+class ListingJob(threading.Thread):
+    """Lists a directory on a worker thread, posting to `messages`:
+    
+    ('first', EntryTable)  the first screenful read, sorted, right away
+    ('progress', count)    entries read so far
+    ('table', EntryTable)  the whole listing, sorted
+    ('done',) or ('error', message) last
+    """
+    
+    def __init__(self, directory, stat=True):
+        super().__init__(daemon=True)
+        self.directory = directory
+        self.stat = stat
+        self.messages = queue.SimpleQueue()
+        self.cancelled = threading.Event()
+        self._reported = None
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    def progress(self, folders, files):
+        if self.cancelled.is_set():
+            raise ListingCancelled()
+        count = len(folders) + len(files)
+        if self._reported is None:
+            first = EntryTable(self.directory, sorted(folders, key=str.lower),
+                               sorted(files, key=lambda f: f[0].lower()))
+            self.messages.put(('first', first))
+            self._reported = count
+        elif count - self._reported >= ROW_BATCH:
+            self.messages.put(('progress', count))
+            self._reported = count
+    
+    def run(self):
+        try:
+            table = scan_directory(self.directory, self.stat, progress=self.progress)
+            self.messages.put(('table', table))
+            self.messages.put(('done',))
+        except ListingCancelled:
+            pass
+        except OSError as e:
+            self.messages.put(('error', str(e)))
+
+
+def stat_entry(directory, name):
+    """(is_dir, size, mtime) of one entry the way scan_directory records it,
+    or None when it is gone, hidden or neither a file nor a folder
+    """
+    if name.startswith('.'):
+        return None
+    try:
+        st = os.stat(os.path.join(directory, name))
+    except OSError:
+        return None
+    if S_ISDIR(st.st_mode):
+        return True, 0, 0.0
+    if S_ISREG(st.st_mode):
+        return False, st.st_size, st.st_mtime
+    return None
+
+
+def snapshot(table):
+    """{name: stat_entry()-style info} for every live row of an EntryTable"""
+    dirs, sizes, mtimes = table.dirs, table.sizes, table.mtimes
+    return {name: (dirs[i] == FOLDER, sizes[i], mtimes[i])
+            for i, name in enumerate(table.names) if dirs[i] != REMOVED}
+
+
+class DirectoryWatcher(threading.Thread):
+    """Watches one directory on a worker thread, posting to `messages`:
+    
+    ('changes', [(name, info)])  entries that changed; info is stat_entry()'s
+                                 answer, None for entries that are gone
+    ('rescan',)                  changes were lost, list the directory again
+    ('gone',)                    the directory itself was removed or moved
+    """
+    
+    def __init__(self, directory):
+        super().__init__(daemon=True)
+        self.directory = directory
+        self.messages = queue.SimpleQueue()
+        self.cancelled = threading.Event()
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    def set_baseline(self, entries):
+        """The listing changes are relative to, once it has been read, as a
+        snapshot() taken on the Tk thread; the live table is never shared
+        """
+    
+    def post_changes(self, names):
+        changes = [(name, stat_entry(self.directory, name)) for name in sorted(names)]
+        if not self.cancelled.is_set():
+            self.messages.put(('changes', changes))
+
+
+class InotifyWatcher(DirectoryWatcher):
+    """Linux: the kernel reports changed names through inotify (via ctypes).
+    
+    Events arriving within WATCH_DELAY of each other are posted together,
+    so a burst of writes to one file is one change.
+    """
+    
+    IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+    IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+    IN_DELETE_SELF, IN_MOVE_SELF, IN_Q_OVERFLOW, IN_IGNORED = 0x400, 0x800, 0x4000, 0x8000
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+            | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+    EVENT = struct.Struct('iIII')  # wd, mask, cookie, len; then `len` bytes of name
+    
+    def __init__(self, directory):
+        super().__init__(directory)
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        # cancel() writes here to wake the thread from select()
+        self.wake_read, self.wake_write = os.pipe()
+        self.lock = threading.Lock()
+    
+    def cancel(self):
+        super().cancel()
+        with self.lock:
+            # None once run() has closed it: the number may belong to another file by then
+            if self.wake_write is not None:
+                os.write(self.wake_write, b'x')
+    
+    def run(self):
+        names = set()
+        deadline = None
+        try:
+            while not self.cancelled.is_set():
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                ready, _, _ = select.select([self.fd, self.wake_read], [], [], timeout)
+                if self.wake_read in ready:
+                    return
+                if self.fd in ready:
+                    try:
+                        data = os.read(self.fd, 64 * 1024)
+                    except BlockingIOError:
+                        data = b''
+                    for mask, name in self.parse(data):
+                        if mask & self.IN_Q_OVERFLOW:
+                            self.messages.put(('rescan',))
+                            names.clear()
+                        elif mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF | self.IN_IGNORED):
+                            self.messages.put(('gone',))
+                            return
+                        elif name and not name.startswith('.'):
+                            names.add(name)
+                    if names and deadline is None:
+                        deadline = time.monotonic() + WATCH_DELAY
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.post_changes(names)
+                    names = set()
+                    deadline = None
+        finally:
+            with self.lock:
+                for fd in (self.fd, self.wake_read, self.wake_write):
+                    os.close(fd)
+                self.wake_write = None
+    
+    def parse(self, data):
+        """(mask, name) for each inotify_event in `data`"""
+        offset = 0
+        while offset + self.EVENT.size <= len(data):
+            _, mask, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            yield mask, name
+
+
+class PollingWatcher(DirectoryWatcher):
+    """Everywhere else: lists the directory again every so often and compares
+    (is_dir, size, mtime) snapshots. The interval grows with the time a
+    listing takes, so huge folders aren't re-read back to back.
+    """
+    
+    def __init__(self, directory, interval=WATCH_INTERVAL):
+        super().__init__(directory)
+        self.interval = interval
+        self.baseline = None
+        self.ready = threading.Event()
+    
+    def set_baseline(self, entries):
+        self.baseline = entries
+        self.ready.set()
+    
+    def run(self):
+        while not self.ready.wait(0.1):
+            if self.cancelled.is_set():
+                return
+        previous, self.baseline = self.baseline, None
+        interval = self.interval
+        while not self.cancelled.wait(interval):
+            start = time.perf_counter()
+            try:
+                current = snapshot(scan_directory(self.directory))
+            except OSError:
+                self.messages.put(('gone',))
+                return
+            changed = [name for name, info in current.items() if previous.get(name) != info]
+            changed.extend(name for name in previous if name not in current)
+            if changed and not self.cancelled.is_set():
+                self.messages.put(('changes', [(name, current.get(name)) for name in changed]))
+            previous = current
+            interval = max(self.interval, 10 * (time.perf_counter() - start))
+
+
+def watch_directory(directory):
+    """An unstarted watcher for `directory`: inotify where there is one"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            # Out of inotify watches, or a libc without it
+            pass
+    return PollingWatcher(directory)
+
+
+def thumbnail_cache_dir():
+    """Per-user directory for preview thumbnails, created on demand"""
+    if sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    elif sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    path = base / "FileManager" / "thumbnails"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def make_thumbnail(path, cache_file, size=THUMB_SIZE):
+    """Runs in a worker process: scale the image at `path` to fit `size` and
+    save it as a PNG at `cache_file`. JPEGs are decoded at a reduced scale
+    with Image.draft, so a 24 MP photo never gets decoded at full size.
+    """
+    from PIL import Image
+    with Image.open(path) as image:
+        if image.format == 'JPEG':
+            # Twice the target size leaves LANCZOS something to work with
+            image.draft(image.mode, (size[0] * 2, size[1] * 2))
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        if image.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+            image = image.convert('RGBA' if 'A' in image.mode else 'RGB')
+        # Written under another name first: a half-written file is never a hit
+        partial = f"{cache_file}.{os.getpid()}.part"
+        image.save(partial, 'PNG')
+    os.replace(partial, cache_file)
+    return cache_file
+
+
+class Thumbnails:
+    """Preview images for the file manager, made off the UI thread.
+    
+    Thumbnails are made by make_thumbnail in a process pool and stored as
+    PNGs in thumbnail_cache_dir(), named after (path, size, mtime), so an
+    edited file gets a new one. The last `memory` PhotoImages are kept in
+    an LRU, so going back to a recent file redraws at once.
+    """
+    
+    def __init__(self, root, cache_dir=None, memory=THUMB_MEMORY, workers=None):
+        self.root = root
+        self.cache_dir = Path(cache_dir) if cache_dir else thumbnail_cache_dir()
+        self.memory = memory
+        self.photos = OrderedDict()
+        self.pending = {}  # key -> Future
+        self.waiters = {}  # key -> [callback(path, photo, error)]
+        self.results = queue.SimpleQueue()
+        self.polling = False
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.pool = None
+    
+    def key(self, path, size, mtime):
+        return hashlib.sha1(f"{path}\0{size}\0{mtime!r}".encode()).hexdigest()
+    
+    def get(self, path, size, mtime):
+        """The PhotoImage if it is in memory or on disk already, else None"""
+        key = self.key(path, size, mtime)
+        photo = self.photos.get(key)
+        if photo is not None:
+            self.photos.move_to_end(key)
+            return photo
+        cache_file = self.cache_dir / f"{key}.png"
+        if cache_file.exists():
+            return self._load(key, cache_file)
+        return None
+    
+    def request(self, path, size, mtime, callback=None):
+        """Make the thumbnail in the background; callback(path, photo, error)
+        is called from the Tk loop when it is ready
+        """
+        key = self.key(path, size, mtime)
+        if callback is not None:
+            self.waiters.setdefault(key, []).append(callback)
+        if key in self.pending:
+            return
+        cache_file = str(self.cache_dir / f"{key}.png")
+        try:
+            future = self._executor().submit(make_thumbnail, str(path), cache_file)
+        except BrokenProcessPool:
+            # A worker died (e.g. on a malformed image); start a fresh pool
+            self.pool = None
+            future = self._executor().submit(make_thumbnail, str(path), cache_file)
+        self.pending[key] = future
+        future.add_done_callback(lambda f, key=key, path=path: self.results.put((key, path, f)))
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_MS, self._poll)
+    
+    def prefetch(self, items):
+        """Make thumbnails for (path, size, mtime) `items` ahead of time.
+        Queued prefetches that aren't in `items` any more are dropped.
+        """
+        wanted = set()
+        for path, size, mtime in items:
+            key = self.key(path, size, mtime)
+            wanted.add(key)
+            if self.get(path, size, mtime) is None:
+                self.request(path, size, mtime)
+        for key, future in list(self.pending.items()):
+            if key not in wanted and key not in self.waiters and future.cancel():
+                del self.pending[key]
+    
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+    
+    def _executor(self):
+        if self.pool is None:
+            # Spawned, not forked: the UI process has Tk and threads running
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self.pool
+    
+    def _load(self, key, cache_file):
+        photo = tk.PhotoImage(file=str(cache_file))
+        self.photos[key] = photo
+        if len(self.photos) > self.memory:
+            self.photos.popitem(last=False)
+        return photo
+    
+    def _poll(self):
+        while True:
+            try:
+                key, path, future = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if self.pending.get(key) is future:
+                del self.pending[key]
+            if future.cancelled():
+                continue
+            photo = error = None
+            try:
+                photo = self._load(key, future.result())
+            except Exception as e:
+                error = str(e)
+            for callback in self.waiters.pop(key, ()):
+                callback(path, photo, error)
+        if self.pending:
+            self.root.after(POLL_MS, self._poll)
+        else:
+            self.polling = False
+
+
+class VirtualList(tk.Frame):
+    """The file list: rows of an EntryTable drawn on a Canvas, only those in view.
+    
+    `order` holds table indices in display order, so sorting by a column
+    rearranges an array of ints and leaves the table alone. The selection
+    is a set of table indices and survives re-sorting. Generates
+    <<ListSelect>> when the selection changes and <<ListOpen>> on
+    double-click or Return.
+    """
+    
+    SIZE_WIDTH = 80
+    MTIME_WIDTH = 100
+    SELECTED_BG = '#cce0ff'
+    ACTIVE_OUTLINE = '#5b8fd6'
+    
+    def __init__(self, master, font=('Consolas', 10)):
+        super().__init__(master, bg='#f0f0f0')
+        self.font = tkfont.Font(font=font)
+        self.row_height = self.font.metrics('linespace') + 4
+        self.char_width = max(1, self.font.measure('0'))
+        
+        self.table = EntryTable(Path.home())
+        self.order = array('l')
+        self.selected = set()
+        self.anchor = 0
+        self.active = None  # view position of the focused row
+        self.top = 0  # view position of the first row drawn
+        self.sort_column = 'name'
+        self.sort_reverse = False
+        self.lines = []  # canvas items per drawn line: background, name, size, modified
+        self.x_size = self.x_mtime = 0
+        
+        self.header = tk.Canvas(self, height=self.row_height + 2, bg='#e4e4e4', highlightthickness=0)
+        self.canvas = tk.Canvas(self, bg='white', highlightthickness=0, takefocus=True)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.header.grid(row=0, column=0, sticky='ew')
+        self.canvas.grid(row=1, column=0, sticky='nsew')
+        self.scrollbar.grid(row=0, column=1, rowspan=2, sticky='ns')
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        
+        self.canvas.bind('<Configure>', lambda e: self.redraw())
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<Shift-Button-1>', lambda e: self.on_click(e, extend=True))
+        self.canvas.bind('<Control-Button-1>', lambda e: self.on_click(e, toggle=True))
+        self.canvas.bind('<Double-1>', lambda e: self.event_generate('<<ListOpen>>'))
+        self.canvas.bind('<Return>', lambda e: self.event_generate('<<ListOpen>>'))
+        self.canvas.bind('<MouseWheel>', self.on_wheel)
+        self.canvas.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll(3))
+        steps = {'Up': lambda: -1, 'Down': lambda: 1,
+                 'Prior': lambda: -self.visible_rows(), 'Next': self.visible_rows,
+                 'Home': lambda: -len(self.order), 'End': lambda: len(self.order)}
+        for key, step in steps.items():
+            self.canvas.bind(f'<{key}>', lambda e, step=step: self.move(step()))
+            self.canvas.bind(f'<Shift-{key}>', lambda e, step=step: self.move(step(), extend=True))
+        self.header.bind('<Button-1>', self.on_header_click)
+    
+    def set_table(self, table):
+        """Show `table` sorted by the current column, nothing selected"""
+        self.table = table
+        self.order = table.sort_order(self.sort_column, self.sort_reverse)
+        self.selected = set()
+        self.anchor = 0
+        self.active = None
+        self.top = 0
+        self.redraw()
+    
+    def refresh(self):
+        """Re-sort after rows were added to the table, keeping the selection"""
+        self.sort_by(self.sort_column, self.sort_reverse)
+    
+    def sort_by(self, column, reverse=False):
+        focused = self.order[self.active] if self.active is not None else None
+        self.sort_column, self.sort_reverse = column, reverse
+        self.order = self.table.sort_order(column, reverse)
+        if focused is not None:
+            self.active = self.anchor = self.order.index(focused)
+            self.see(self.active)
+        self.redraw()
+    
+    def apply_changes(self, removed=(), inserted=(), updated=()):
+        """Fold table rows that were removed, appended or updated in place
+        into the view: each is taken out of or put into `order` where it
+        sorts, instead of sorting everything again
+        """
+        order = self.order
+        focused = order[self.active] if self.active is not None else None
+        anchor = order[self.anchor] if self.anchor < len(order) else None
+        top_row = order[self.top] if self.top < len(order) else None
+        
+        for i in chain(removed, updated):
+            try:
+                del order[order.index(i)]
+            except ValueError:
+                pass
+        for i in chain(updated, inserted):
+            order.insert(self.position(i), i)
+        
+        def position_of(i, default):
+            return default if i is None or i in removed else order.index(i)
+        
+        gone = self.selected.intersection(removed)
+        self.selected -= gone
+        self.active = position_of(focused, None)
+        self.anchor = position_of(anchor, 0)
+        # Keep the same row at the top, so the list doesn't jump under the pointer
+        self.set_top(position_of(top_row, self.top))
+        if gone:
+            self.event_generate('<<ListSelect>>')
+    
+    def position(self, i):
+        """Where table row i belongs in `order`, after any rows sorting equal"""
+        table, order, column = self.table, self.order, self.sort_column
+        is_dir = table.is_dir(i)
+        key = table.row_key(i, column)
+        low, high = 0, len(order)
+        while low < high:
+            mid = (low + high) // 2
+            j = order[mid]
+            if table.is_dir(j) != is_dir:
+                # Folders come before files whatever the column
+                after = is_dir
+            else:
+                other = table.row_key(j, column)
+                after = other < key if self.sort_reverse else other > key
+            if after:
+                high = mid
+            else:
+                low = mid + 1
+        return low
+    
+    def selection(self):
+        """Selected table indices, in display order"""
+        if len(self.selected) < 2:
+            return list(self.selected)
+        selected = self.selected
+        return [i for i in self.order if i in selected]
+    
+    def current(self):
+        """Table index of the focused row if it is selected, else None"""
+        if self.active is None or self.active >= len(self.order):
+            return None
+        i = self.order[self.active]
+        return i if i in self.selected else None
+    
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+    
+    def on_click(self, event, extend=False, toggle=False):
+        self.canvas.focus_set()
+        pos = self.top + event.y // self.row_height
+        if pos < len(self.order):
+            self.select(pos, extend, toggle)
+    
+    def on_header_click(self, event):
+        if event.x >= self.x_mtime:
+            column = 'mtime'
+        elif event.x >= self.x_size - self.SIZE_WIDTH:
+            column = 'size'
+        else:
+            column = 'name'
+        # A second click on the same column flips the direction
+        self.sort_by(column, not self.sort_reverse if column == self.sort_column else False)
+    
+    def on_wheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        self.scroll(-(event.delta // 120) * 3 if abs(event.delta) >= 120 else -event.delta)
+    
+    def select(self, pos, extend=False, toggle=False):
+        i = self.order[pos]
+        if extend:
+            low, high = sorted((self.anchor, pos))
+            self.selected = set(self.order[low:high + 1])
+        elif toggle:
+            self.selected ^= {i}
+            self.anchor = pos
+        else:
+            self.selected = {i}
+            self.anchor = pos
+        self.active = pos
+        self.see(pos)
+        self.redraw()
+        self.event_generate('<<ListSelect>>')
+    
+    def move(self, delta, extend=False):
+        if not self.order:
+            return
+        pos = 0 if self.active is None else self.active + delta
+        self.select(min(max(pos, 0), len(self.order) - 1), extend)
+    
+    def see(self, pos):
+        rows = self.visible_rows()
+        if pos < self.top:
+            self.top = pos
+        elif pos >= self.top + rows:
+            self.top = pos - rows + 1
+    
+    def scroll(self, rows):
+        self.set_top(self.top + rows)
+    
+    def set_top(self, top):
+        self.top = max(0, min(top, len(self.order) - self.visible_rows()))
+        self.redraw()
+    
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if args[0] == 'moveto':
+            self.set_top(int(float(args[1]) * len(self.order)))
+        elif args[0] == 'scroll':
+            count = int(args[1])
+            self.scroll(count * self.visible_rows() if args[2] == 'pages' else count)
+    
+    def redraw(self):
+        """Draw the rows in view, reusing one set of canvas items per line"""
+        canvas = self.canvas
+        width = canvas.winfo_width()
+        rows = self.visible_rows() + 1
+        while len(self.lines) < rows:
+            self.lines.append((canvas.create_rectangle(0, 0, 0, 0, outline=''),
+                               canvas.create_text(0, 0, anchor='nw', font=self.font),
+                               canvas.create_text(0, 0, anchor='ne', font=self.font),
+                               canvas.create_text(0, 0, anchor='nw', font=self.font)))
+        while len(self.lines) > rows:
+            canvas.delete(*self.lines.pop())
+        
+        self.x_mtime = width - self.MTIME_WIDTH
+        self.x_size = self.x_mtime - 12
+        name_chars = max(4, (self.x_size - self.SIZE_WIDTH - 12) // self.char_width)
+        table, order, count = self.table, self.order, len(self.order)
+        for line, (background, name, size, modified) in enumerate(self.lines):
+            pos = self.top + line
+            if pos >= count:
+                for item in (background, name, size, modified):
+                    canvas.itemconfigure(item, state='hidden')
+                continue
+            i = order[pos]
+            y = line * self.row_height
+            name_text, size_text, modified_text = table.cells(i)
+            if len(name_text) > name_chars:
+                name_text = name_text[:name_chars - 1] + '…'
+            canvas.coords(background, 0, y, width - 1, y + self.row_height - 1)
+            canvas.itemconfigure(background, state='normal',
+                                 fill=self.SELECTED_BG if i in self.selected else '',
+                                 outline=self.ACTIVE_OUTLINE if pos == self.active else '')
+            canvas.coords(name, 6, y + 2)
+            canvas.itemconfigure(name, state='normal', text=name_text)
+            canvas.coords(size, self.x_size, y + 2)
+            canvas.itemconfigure(size, state='normal', text=size_text)
+            canvas.coords(modified, self.x_mtime, y + 2)
+            canvas.itemconfigure(modified, state='normal', text=modified_text)
+        
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + rows - 1) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.draw_header()
+    
+    def draw_header(self):
+        self.header.delete('all')
+        arrow = ' ▼' if self.sort_reverse else ' ▲'
+        for column, title, x, anchor in (('name', "Name", 6, 'nw'),
+                                         ('size', "Size", self.x_size, 'ne'),
+                                         ('mtime', "Modified", self.x_mtime, 'nw')):
+            if column == self.sort_column:
+                title += arrow
+            self.header.create_text(x, 2, text=title, anchor=anchor, font=self.font)
+
+
 class FileManagerApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Enhanced File Manager")
         self.root.geometry("1000x700")
         
-        self.files = []
+        self.entries = EntryTable(Path.home() / "Downloads")
         self.current_directory = Path.home() / "Downloads"
+        self.listing = None
+        self.watcher = None
+        self.watch_backlog = []
+        self.preview_job = None
+        self.preview_path = None
+        self.thumbnails = Thumbnails(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.setup_ui()
         self.load_downloads()
@@ -43,21 +899,13 @@ class FileManagerApp:
         list_frame = tk.LabelFrame(content_frame, text="Files", bg='#f0f0f0', padx=10, pady=10)
         list_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
         
-        # File listbox with scrollbar
-        list_container = tk.Frame(list_frame, bg='#f0f0f0')
-        list_container.pack(fill=tk.BOTH, expand=True)
-        
-        self.listbox = tk.Listbox(list_container, selectmode=tk.EXTENDED, 
-                                 font=('Consolas', 10), height=20)
-        scrollbar = tk.Scrollbar(list_container, orient=tk.VERTICAL, command=self.listbox.yview)
-        self.listbox.configure(yscrollcommand=scrollbar.set)
-        
-        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # File list: draws only the rows in view, click a column title to sort
+        self.file_list = VirtualList(list_frame, font=('Consolas', 10))
+        self.file_list.pack(fill=tk.BOTH, expand=True)
         
         # Bind selection and double-click events
-        self.listbox.bind('<<ListboxSelect>>', self.on_file_select)
-        self.listbox.bind('<Double-1>', self.on_double_click)
+        self.file_list.bind('<<ListSelect>>', self.on_file_select)
+        self.file_list.bind('<<ListOpen>>', self.on_double_click)
         
         # Preview frame
         preview_frame = tk.LabelFrame(content_frame, text="Preview", bg='#f0f0f0', 
@@ -94,80 +942,160 @@ class FileManagerApp:
             btn.grid(row=0, column=i, padx=5, pady=5)
     
     def load_downloads(self):
+        self.cancel_listing()
+        self.stop_watching()
         if not self.current_directory.exists():
             messagebox.showerror("Error", f"Directory not found: {self.current_directory}")
             return
         
-        self.files = []
-        self.listbox.delete(0, tk.END)
+        self.entries = EntryTable(self.current_directory)
+        self.file_list.set_table(self.entries)
+        self.dir_label.config(text=f"Current Directory: {self.current_directory} (loading...)")
+        self.cancel_preview()
+        self.clear_preview()
+        self.preview_canvas.create_text(135, 90, text="📁\nLoading...", 
+                                       justify=tk.CENTER, font=('Helvetica', 14))
         
-        # Load files and folders from directory
-        try:
-            items = []
-            # First add folders
-            for item_path in self.current_directory.iterdir():
-                if item_path.is_dir() and not item_path.name.startswith('.'):
-                    items.append((item_path, True))  # True for directory
-            
-            # Then add files
-            for item_path in self.current_directory.iterdir():
-                if item_path.is_file() and not item_path.name.startswith('.'):
-                    items.append((item_path, False))  # False for file
-            
-            # Sort items: folders first, then files
-            items.sort(key=lambda x: (not x[1], x[0].name.lower()))
-            
-            for item_path, is_dir in items:
-                if is_dir:
-                    # Add folder to list
-                    self.files.append(item_path)
-                    display_text = f"📁 {item_path.name:<38} <DIR>"
-                    self.listbox.insert(tk.END, display_text)
-                else:
-                    # Add file to list
-                    self.files.append(item_path)
-                    
-                    # Format file info
-                    size = self.format_file_size(item_path.stat().st_size)
-                    modified = datetime.fromtimestamp(item_path.stat().st_mtime).strftime('%m/%d %H:%M')
-                    
-                    # Insert into listbox
-                    display_text = f"📄 {item_path.name:<38} {size:>8} {modified}"
-                    self.listbox.insert(tk.END, display_text)
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not load files: {str(e)}")
+        # Watch before listing, so nothing that happens meanwhile is missed;
+        # changes wait in watch_backlog until the listing is complete
+        self.watcher = watch_directory(self.current_directory)
+        self.watcher.start()
+        self.follow_job(self.watcher, self.on_watch_message, WATCH_POLL_MS)
         
-        # Update directory label
-        self.dir_label.config(text=f"Current Directory: {self.current_directory} ({len(self.files)} files)")
+        # Read the folder on a worker thread; its rows arrive in on_listing_message
+        self.listing = ListingJob(self.current_directory)
+        self.listing.start()
+        self.follow_job(self.listing, self.on_listing_message)
+    
+    def cancel_listing(self):
+        """Stop listing the current folder, e.g. when navigating away from it"""
+        if self.listing is not None:
+            self.listing.cancel()
+            self.listing = None
+    
+    def stop_watching(self):
+        if self.watcher is not None:
+            self.watcher.cancel()
+            self.watcher = None
+        self.watch_backlog = []
+    
+    def follow_job(self, job, handle, interval=POLL_MS):
+        """Pass `job`'s messages to `handle` from the Tk loop until it ends"""
+        deadline = time.perf_counter() + POLL_BUDGET
+        while not job.cancelled.is_set():
+            try:
+                message = job.messages.get_nowait()
+            except queue.Empty:
+                break
+            handle(*message)
+            if message[0] in ('done', 'error'):
+                return
+            if time.perf_counter() > deadline:
+                break
+        if not job.cancelled.is_set():
+            self.root.after(interval, self.follow_job, job, handle, interval)
+    
+    def on_listing_message(self, kind, *args):
+        """Messages from the current folder's ListingJob"""
+        if kind == 'first':
+            # Something to look at while the rest is read; replaced by 'table'
+            self.entries = args[0]
+            self.file_list.set_table(self.entries)
+        elif kind == 'progress':
+            self.dir_label.config(text=f"Current Directory: {self.current_directory} (loading... {args[0]} files)")
+        elif kind == 'table':
+            self.entries = args[0]
+            self.file_list.set_table(self.entries)
+            self.dir_label.config(text=f"Current Directory: {self.current_directory} ({len(self.entries)} files)")
+            
+            # Show folder preview by default
+            self.show_folder_preview()
+        elif kind == 'done':
+            self.listing = None
+            backlog, self.watch_backlog = self.watch_backlog, []
+            self.apply_changes(backlog)
+            if self.watcher is not None:
+                self.watcher.set_baseline(snapshot(self.entries))
+        elif kind == 'error':
+            self.listing = None
+            self.stop_watching()
+            self.dir_label.config(text=f"Current Directory: {self.current_directory}")
+            messagebox.showerror("Error", f"Could not load files: {args[0]}")
+    
+    def on_watch_message(self, kind, *args):
+        """Messages from the current folder's DirectoryWatcher"""
+        if kind == 'changes':
+            if self.listing is not None:
+                self.watch_backlog.extend(args[0])
+            else:
+                self.apply_changes(args[0])
+        elif kind == 'rescan':
+            self.load_downloads()
+        elif kind == 'gone':
+            # Deleted or moved away: the parent is the nearest thing that still exists
+            self.stop_watching()
+            directory = self.current_directory
+            while not directory.exists() and directory.parent != directory:
+                directory = directory.parent
+            self.current_directory = directory
+            self.load_downloads()
+    
+    def apply_changes(self, changes):
+        """Fold (name, info) changes into the listing, without reading it again"""
+        entries = self.entries
+        removed, inserted, updated = [], [], []
+        for name, info in changes:
+            i = entries.find(name)
+            if i is None:
+                if info is not None:
+                    inserted.append(entries.append(name, *info))
+            elif info is None:
+                entries.remove(i)
+                removed.append(i)
+            elif entries.info(i) != info:
+                entries.update(i, *info)
+                updated.append(i)
+        if not (removed or inserted or updated):
+            return
         
-        # Show folder preview by default
-        self.show_folder_preview()
+        self.file_list.apply_changes(removed, inserted, updated)
+        self.dir_label.config(text=f"Current Directory: {self.current_directory} ({len(entries)} files)")
+        if self.file_list.current() is None:
+            self.show_folder_preview()
+    
+    def refresh_entries(self, paths):
+        """Re-read just these entries of the current folder after changing them"""
+        changes = []
+        for path in paths:
+            # Rows added with add_files are named by their full path
+            name = path.name if path.parent == self.current_directory else str(path)
+            changes.append((name, stat_entry(self.current_directory, name)))
+        if self.listing is not None:
+            self.watch_backlog.extend(changes)
+        else:
+            self.apply_changes(changes)
     
     def format_file_size(self, size):
         """Format file size in human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f}{unit}"
-            size /= 1024.0
-        return f"{size:.1f}TB"
+        return format_file_size(size)
     
     def on_file_select(self, event):
-        """Handle file selection in listbox"""
-        selection = self.listbox.curselection()
-        if selection:
-            index = selection[0]
-            if index < len(self.files):
-                file_path = self.files[index]
-                if file_path.is_dir():
-                    self.show_folder_preview(file_path)
-                else:
-                    self.show_preview(file_path)
+        """Handle file selection in the file list"""
+        index = self.file_list.current()
+        if index is not None:
+            file_path = self.entries.path(index)
+            if self.entries.is_dir(index):
+                self.show_folder_preview(file_path)
+            else:
+                self.show_preview(file_path)
+                self.prefetch_thumbnails()
         else:
             # If nothing is selected, show the current folder preview
             self.show_folder_preview()
     
     def show_preview(self, file_path):
         """Show file preview in the preview panel"""
+        self.cancel_preview()
         self.clear_preview()
         
         # Show file info
@@ -182,24 +1110,17 @@ class FileManagerApp:
             self.info_text.insert(tk.END, info)
             
             # Try to show image preview for image files
-            if file_path.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']:
-                try:
-                    from PIL import Image, ImageTk
-                    image = Image.open(file_path)
-                    # Resize image to fit preview area
-                    image.thumbnail((250, 160), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(image)
-                    
-                    # Store reference to prevent garbage collection
-                    self._preview_image = photo  # <-- change this line
-
-                    # Clear canvas and add image
-                    self.preview_canvas.delete("all")
-                    self.preview_canvas.create_image(135, 90, image=photo)
-                except Exception as e:
+            if file_path.suffix.lower() in IMAGE_SUFFIXES:
+                self.preview_path = file_path
+                photo = self.thumbnails.get(file_path, stat.st_size, stat.st_mtime)
+                if photo is not None:
+                    self.show_thumbnail(file_path, photo, None)
+                else:
+                    # Decoded in a worker process; show_thumbnail draws it when ready
                     self.preview_canvas.delete("all")
-                    self.preview_canvas.create_text(135, 90, text=f"Cannot preview\\n{str(e)}", 
+                    self.preview_canvas.create_text(135, 90, text="Loading preview...", 
                                                    justify=tk.CENTER, font=('Helvetica', 10))
+                    self.thumbnails.request(file_path, stat.st_size, stat.st_mtime, self.show_thumbnail)
             else:
                 # Show file icon or type info
                 self.preview_canvas.delete("all")
@@ -208,25 +1129,52 @@ class FileManagerApp:
         except Exception as e:
             self.info_text.insert(tk.END, f"Error loading file info: {str(e)}")
     
+    def show_thumbnail(self, file_path, photo, error):
+        """Draw a thumbnail from self.thumbnails, if its file is still the one previewed"""
+        if file_path != self.preview_path:
+            return
+        
+        self.preview_canvas.delete("all")
+        if photo is not None:
+            # Store reference to prevent garbage collection
+            self._preview_image = photo
+            self.preview_canvas.create_image(135, 90, image=photo)
+        else:
+            self.preview_canvas.create_text(135, 90, text=f"Cannot preview\n{error}", 
+                                           justify=tk.CENTER, font=('Helvetica', 10))
+    
+    def prefetch_thumbnails(self):
+        """Make thumbnails for the images next to the focused row ahead of time"""
+        view, entries = self.file_list, self.entries
+        if view.active is None:
+            return
+        
+        items = []
+        for pos in range(max(0, view.active - PREFETCH), min(len(view.order), view.active + PREFETCH + 1)):
+            i = view.order[pos]
+            if not entries.is_dir(i) and os.path.splitext(entries.names[i])[1].lower() in IMAGE_SUFFIXES:
+                items.append((entries.path(i), entries.sizes[i], entries.mtimes[i]))
+        self.thumbnails.prefetch(items)
+    
     def clear_preview(self):
         """Clear the preview panel"""
+        self.preview_path = None
         self.preview_canvas.delete("all")
         self.info_text.delete(1.0, tk.END)
     
     def get_selected_files(self):
-        """Get selected files from listbox"""
-        selected_files = []
-        for index in self.listbox.curselection():
-            if index < len(self.files):
-                selected_files.append(self.files[index])
-        return selected_files
+        """Get selected files from the file list"""
+        return [self.entries.path(index) for index in self.file_list.selection()]
     
     def add_files(self):
         paths = filedialog.askopenfilenames()
-        for path in paths:
-            if Path(path) not in self.files:
-                self.files.append(Path(path))
-                self.listbox.insert(tk.END, Path(path).name)
+        known = set(self.entries.paths())
+        for path in map(Path, paths):
+            if path not in known:
+                known.add(path)
+                stat = path.stat()
+                self.entries.append(str(path), False, stat.st_size, stat.st_mtime)
+        self.file_list.refresh()
     
     def move_files(self):
         selected_files = self.get_selected_files()
@@ -244,7 +1192,7 @@ class FileManagerApp:
             except Exception as e:
                 messagebox.showerror("Move Error", str(e))
         
-        self.load_downloads()
+        self.refresh_entries(selected_files)
     
     def delete_files(self):
         selected_files = self.get_selected_files()
@@ -259,7 +1207,7 @@ class FileManagerApp:
                 except Exception as e:
                     messagebox.showerror("Delete Error", str(e))
             
-            self.load_downloads()
+            self.refresh_entries(selected_files)
     
     def open_files(self):
         selected_files = self.get_selected_files()
@@ -292,6 +1240,7 @@ class FileManagerApp:
         if suffix is None:
             return
             
+        changed = list(selected_files)
         for file in selected_files:
             try:
                 name = file.name
@@ -299,23 +1248,28 @@ class FileManagerApp:
                 new_name = f"{prefix or ''}{base}{suffix or ''}{ext}"
                 new_path = file.parent / new_name
                 file.rename(new_path)
+                changed.append(new_path)
             except Exception as e:
                 messagebox.showerror("Rename Error", str(e))
         
-        self.load_downloads()
+        self.refresh_entries(changed)
 
     def on_double_click(self, event):
         """Handle double-click to navigate into folders"""
-        selection = self.listbox.curselection()
-        if selection:
-            index = selection[0]
-            if index < len(self.files):
-                file_path = self.files[index]
-                if file_path.is_dir():
-                    self.current_directory = file_path
-                    self.load_downloads()
-                else:
-                    self.open_files()
+        index = self.file_list.current()
+        if index is not None:
+            if self.entries.is_dir(index):
+                self.current_directory = self.entries.path(index)
+                self.load_downloads()
+            else:
+                self.open_files()
+    
+    def on_close(self):
+        self.cancel_listing()
+        self.stop_watching()
+        self.cancel_preview()
+        self.thumbnails.close()
+        self.root.destroy()
     
     def go_home(self):
         """Navigate to Downloads folder"""
@@ -330,52 +1284,75 @@ class FileManagerApp:
     
     def show_folder_preview(self, folder_path=None):
         """Show folder contents preview"""
+        self.cancel_preview()
         if folder_path is None:
-            folder_path = self.current_directory
+            # The current directory was just listed, no need to read it again;
+            # its names are shown in the file list's order
+            self.render_folder_preview(self.current_directory, self.entries, self.file_list.order)
+            return
             
+        # Other folders are read in the background too, they can be as big
         self.clear_preview()
-        
-        try:
-            # Count items in folder
-            files = []
-            dirs = []
-            
-            for item in folder_path.iterdir():
-                if item.name.startswith('.'):
-                    continue
-                if item.is_dir():
-                    dirs.append(item.name)
-                else:
-                    files.append(item.name)
-            
-            # Show folder info
-            info = f"Folder: {folder_path.name}\n"
-            info += f"Path: {folder_path}\n"
-            info += f"Folders: {len(dirs)}\n"
-            info += f"Files: {len(files)}\n\n"
-            
-            if dirs:
-                info += "Recent Folders:\n"
-                for d in sorted(dirs)[:10]:
-                    info += f"  📁 {d}\n"
-            
-            if files:
-                info += "\nRecent Files:\n"
-                for f in sorted(files)[:10]:
-                    info += f"  📄 {f}\n"
-            
-            self.info_text.insert(tk.END, info)
-            
-            # Show folder icon
-            self.preview_canvas.delete("all")
-            self.preview_canvas.create_text(135, 90, text=f"📁\n{len(files)} files\n{len(dirs)} folders", 
-                                           justify=tk.CENTER, font=('Helvetica', 14))
-            
-        except Exception as e:
-            self.info_text.insert(tk.END, f"Error reading folder: {str(e)}")
-            self.preview_canvas.delete("all")
+        self.preview_canvas.create_text(135, 90, text="📁\nReading...", 
+                                       justify=tk.CENTER, font=('Helvetica', 14))
+        self.preview_job = ListingJob(folder_path, stat=False)
+        self.preview_job.start()
+        self.follow_job(self.preview_job, self.on_preview_message)
+    
+    def cancel_preview(self):
+        if self.preview_job is not None:
+            self.preview_job.cancel()
+            self.preview_job = None
+    
+    def on_preview_message(self, kind, *args):
+        """Messages from the folder preview's ListingJob"""
+        if kind == 'table':
+            self.render_folder_preview(args[0].directory, args[0])
+        elif kind == 'error':
+            self.preview_job = None
+            self.clear_preview()
+            self.info_text.insert(tk.END, f"Error reading folder: {args[0]}")
             self.preview_canvas.create_text(135, 90, text=f"📁\nFolder", 
                                            justify=tk.CENTER, font=('Helvetica', 14))
+        elif kind == 'done':
+            self.preview_job = None
+    
+    def render_folder_preview(self, folder_path, entries, order=None):
+        """Fill the preview panel from a listing of `folder_path`, the first
+        names taken in `order` (by default, by name)
+        """
+        self.clear_preview()
+        
+        # Count items in folder
+        if order is None:
+            order = entries.sort_order()
+        folder_count = entries.folder_count()
+        dirs = [entries.names[i] for i in order[:min(10, folder_count)]]
+        files = [entries.names[i] for i in order[folder_count:folder_count + 10]]
+        file_count = len(order) - folder_count
+        
+        # Show folder info
+        info = f"Folder: {folder_path.name}\n"
+        info += f"Path: {folder_path}\n"
+        info += f"Folders: {folder_count}\n"
+        info += f"Files: {file_count}\n\n"
+        
+        if dirs:
+            info += "Recent Folders:\n"
+            for d in dirs[:10]:
+                info += f"  📁 {d}\n"
+        
+        if files:
+            info += "\nRecent Files:\n"
+            for f in files[:10]:
+                info += f"  📄 {f}\n"
+        
+        self.info_text.insert(tk.END, info)
+        
+        # Show folder icon
+        self.preview_canvas.delete("all")
+        self.preview_canvas.create_text(135, 90, text=f"📁\n{file_count} files\n{folder_count} folders", 
+                                       justify=tk.CENTER, font=('Helvetica', 14))
 
 if __name__ == "__main__":
     root = tk.Tk()
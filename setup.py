@@ -1,16 +1,26 @@
+from pathlib import Path
+
 from setuptools import setup
 
+# src/ holds flat modules that import each other by name (`python src/app.py`
+# works as is), so they are installed as top-level modules rather than a package.
+MODULES = sorted(p.stem for p in Path("src").glob("*.py") if p.stem != "create_icon")
+
 setup(
     name="wiki-search",
     version="1.0",
-    packages=["src"],
+    package_dir={"": "src"},
+    py_modules=MODULES,
     install_requires=[
         "PyQt6",
         "requests"
     ],
+    extras_require={
+        "fast-json": ["msgspec"],
+    },
     entry_points={
         "console_scripts": [
-            "wiki-search=src.app:main",
+            "wiki-search=app:main",
         ],
     },
 )
\ No newline at end of file
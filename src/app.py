@@ -1,84 +1,310 @@
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QLineEdit, QPushButton, QLabel, QComboBox, 
-                           QTableWidget, QFrame, QHBoxLayout, QProgressBar,
-                           QTableWidgetItem, QHeaderView)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl
-from PyQt6.QtGui import QFont, QCursor, QDesktopServices
+                           QTableView, QFrame, QHBoxLayout, QProgressBar,
+                           QHeaderView, QCheckBox, QSplitter)
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal, QUrl
+from PyQt6.QtGui import QFont, QDesktopServices
+import argparse
+import asyncio
+import logging
 import sys
-import requests
-import webbrowser
-import threading
+import time
 
-class SearchThread(QThread):
-    finished = pyqtSignal(list, str)
-    error = pyqtSignal(str)
+import wiki_api
+import wiki_http
+from search_cache import SearchCache, LRUCache
+from search_engine import SearchEngine, PagedSearch
+from offline_index import OfflineIndex
+from title_index import TitleIndex
+from results_model import ResultsTableModel, LinkButtonDelegate
+from preview_pane import PreviewPane
+from results import ResultSet
+from search_metrics import SearchTiming, MetricsRecorder
+from wikis import DEFAULT_WIKIS, parse_wikis
+
+log = logging.getLogger(__name__)
+
+# The whole look of the window, parsed once for the application instead of
+# once per widget. Widgets are matched by objectName.
+STYLESHEET = """
+    QLabel#titleLabel {
+        color: navy;
+    }
+    QFrame#searchFrame {
+        background-color: lightblue;
+        border: 2px solid gray;
+    }
+    QLabel#searchLabel {
+        color: darkblue;
+    }
+    QLineEdit#searchEntry {
+        background-color: #1A237E;
+        color: white;
+        padding: 12px;
+        font-size: 16px;
+        border: none;
+        border-radius: 8px;
+    }
+    QLineEdit#searchEntry:focus {
+        background-color: #283593;
+        border: 2px solid #3949AB;
+    }
+    QLineEdit#searchEntry::placeholder {
+        color: #9FA8DA;
+    }
+    QPushButton#searchButton {
+        background-color: #3498DB;
+        color: white;
+        padding: 10px 30px;
+        border: none;
+        border-radius: 8px;
+        min-width: 100px;
+    }
+    QPushButton#searchButton:hover {
+        background-color: #2980B9;
+    }
+    QPushButton#searchButton:pressed {
+        background-color: #2471A3;
+    }
+    QPushButton#searchButton:disabled {
+        background-color: #BDC3C7;
+    }
+    QLabel#statusLabel {
+        color: #7F8C8D;
+    }
+    QTableView#resultsTable {
+        background-color: #F8F9FA;
+        border-radius: 8px;
+        padding: 10px;
+    }
+    QTableView#resultsTable::item {
+        padding: 10px;
+    }
+    QTableView#resultsTable::item:hover {
+        background-color: #E9ECEF;
+    }
+"""
+
+
+def merge_articles(primary, secondary, limit):
+    """`primary` first, then rows of `secondary` with new titles, up to `limit`"""
+    merged = primary[:limit]
+    seen = set(merged.titles)
+    for i, title in enumerate(secondary.titles):
+        if len(merged) >= limit:
+            break
+        if title not in seen:
+            seen.add(title)
+            merged.append_row(secondary, i)
+    return merged
+
+class SearchBridge(QObject):
+    """Runs searches on the asyncio SearchEngine and hands results to Qt.
     
-    def __init__(self, query, limit):
-        super().__init__()
-        self.query = query
-        self.limit = limit
+    Signals are emitted on the engine thread and queued by Qt to the GUI
+    thread. Every signal carries the generation of the search that produced
+    it so the window can drop results from superseded searches.
+    """
+    # ResultSets travel as `object`, so PyQt passes the reference instead of
+    # converting the rows
+    finished = pyqtSignal(object, str, int, object)  # articles, query, generation, SearchTiming
+    offline_finished = pyqtSignal(object, str, int)
+    page_ready = pyqtSignal(object, int, int)  # articles, total hits, generation
+    paged_done = pyqtSignal(int, int)        # rows loaded, generation
+    # wiki, articles (None if it failed), error message, generation, SearchTiming
+    federated_result = pyqtSignal(object, object, str, int, object)
+    federated_done = pyqtSignal(int)         # generation
+    error = pyqtSignal(str, int)
+    summaries_ready = pyqtSignal(str, dict)       # source, {title: summary with 'image' bytes}
+    summaries_failed = pyqtSignal(str, list, str) # source, titles, error message
+    title_index_read = pyqtSignal(object)         # records from TitleIndex.read()
+    
+    def __init__(self, engine, cache=None, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.cache = cache
         
-    def run(self):
-        try:
-            # Add proper headers
-            headers = {
-                'User-Agent': 'WikiSearchApp/1.0 (your@email.com)',  # Replace with your email
-                'Accept': 'application/json'
-            }
-            
-            search_url = "https://en.wikipedia.org/w/api.php"
-            search_params = {
-                'action': 'opensearch',
-                'search': self.query,
-                'limit': self.limit,
-                'format': 'json',
-                'namespace': '0'
-            }
-            
-            response = requests.get(
-                search_url, 
-                params=search_params, 
-                headers=headers,
-                timeout=15
-            )
-            
-            if response.status_code == 429:
-                self.error.emit("Rate limit reached. Please wait a few seconds and try again.")
-                return
-            
-            response.raise_for_status()
-            
-            data = response.json()
+    def search(self, query, limit, generation, namespace=0):
+        """Start an opensearch; cancelling the returned future drops the request"""
+        timing = SearchTiming(query)
+        future = self.engine.submit(self._search(query, limit, namespace, timing))
+        future.add_done_callback(lambda f: self._deliver(
+            f, generation, lambda articles: self.finished.emit(articles, query, generation, timing)))
+        return future
+        
+    async def _search(self, query, limit, namespace, timing):
+        articles = await self.engine.opensearch(query, limit, namespace, timing)
+        if self.cache is not None:
+            # SQLite write and commit: on the I/O executor, not the event loop.
+            # Awaited, so the rows are stored before the table can edit them.
+            await self.engine.run_blocking(self.cache.put, query, limit, articles, namespace)
+        return articles
+        
+    def offline_search(self, index, query, limit, generation):
+        """Query the local dump index off the GUI thread"""
+        future = self.engine.submit(self.engine.run_blocking(index.search, query, limit))
+        future.add_done_callback(lambda f: self._deliver(
+            f, generation, lambda articles: self.offline_finished.emit(articles, query, generation)))
+        return future
+        
+    def paged_search(self, query, page_size, prefetch_pages, generation, namespace=0):
+        """Start a streaming list=search; returns (PagedSearch, future)"""
+        paged = PagedSearch(self.engine, query, page_size, prefetch_pages, namespace,
+                            on_page=lambda articles, total: self.page_ready.emit(
+                                articles, total, generation))
+        future = self.engine.submit(paged.run())
+        future.add_done_callback(lambda f: self._deliver(
+            f, generation, lambda loaded: self.paged_done.emit(loaded, generation)))
+        return paged, future
+        
+    def federated_search(self, query, wikis, limit, generation, namespace=0):
+        """Search several wikis at once; each one's results are emitted as it answers"""
+        def on_result(wiki, articles, error, timing):
+            self.federated_result.emit(wiki, articles, error or "", generation, timing)
             
-            if len(data) < 4:
-                self.error.emit("Invalid response format from Wikipedia API")
-                return
+        future = self.engine.submit(self.engine.federated(query, wikis, limit, namespace, on_result))
+        future.add_done_callback(lambda f: self._deliver(
+            f, generation, lambda results: self.federated_done.emit(generation)))
+        return future
+        
+    def fetch_summaries(self, titles, thumb_size=PreviewPane.THUMB_SIZE, wiki=None):
+        """Fetch extracts and thumbnails for up to 20 titles of `wiki` (the
+        configured one by default) in one batched request
+        """
+        source = wiki.name if wiki is not None else ''
+        future = self.engine.submit(self._summaries(titles, thumb_size, wiki))
+        future.add_done_callback(lambda f: self._deliver_summaries(f, source, titles))
+        return future
+        
+    async def _summaries(self, titles, thumb_size, wiki):
+        summaries = await self.engine.summaries(titles, thumb_size, wiki)
+        
+        async def attach_image(summary):
+            try:
+                summary['image'] = await self.engine.fetch_image(summary['thumbnail'])
+            except wiki_http.network_errors():
+                summary['image'] = None
                 
-            titles = data[1] if len(data) > 1 else []
-            descriptions = data[2] if len(data) > 2 else []
-            urls = data[3] if len(data) > 3 else []
-            
-            articles = []
-            for i, title in enumerate(titles):
-                articles.append({
-                    'title': title,
-                    'description': descriptions[i] if i < len(descriptions) else 'No description',
-                    'url': urls[i] if i < len(urls) else '',
-                })
-            
-            self.finished.emit(articles, self.query)
-            
-        except requests.exceptions.RequestException as e:
-            self.error.emit(f"Network error: {str(e)}")
-        except Exception as e:
-            self.error.emit(str(e))
+        # Several requested titles can redirect to the same page
+        unique = {id(s): s for s in summaries.values() if s['thumbnail']}
+        await asyncio.gather(*(attach_image(s) for s in unique.values()))
+        
+        # Remember titles without a page too, so they aren't fetched again;
+        # engine.summaries only asked for the first MAX_SUMMARY_TITLES
+        for title in titles[:wiki_api.MAX_SUMMARY_TITLES]:
+            summaries.setdefault(title, {'title': title, 'extract': '', 'thumbnail': ''})
+        return summaries
+        
+    def read_title_index(self, index):
+        """Read the persisted title index on the I/O executor"""
+        future = self.engine.submit(self.engine.run_blocking(index.read))
+        future.add_done_callback(self._deliver_title_index)
+        return future
+        
+    def _deliver_title_index(self, future):
+        if future.cancelled():
+            return
+        e = future.exception()
+        if e is None:
+            self.title_index_read.emit(future.result())
+        else:
+            log.warning("could not read the title index: %s", e)
+        
+    def _deliver_summaries(self, future, source, titles):
+        if future.cancelled():
+            return
+        e = future.exception()
+        if e is None:
+            self.summaries_ready.emit(source, future.result())
+        else:
+            self.summaries_failed.emit(source, list(titles), str(e))
+        
+    def _deliver(self, future, generation, emit):
+        if future.cancelled():
+            return
+        e = future.exception()
+        if e is None:
+            emit(future.result())
+        elif isinstance(e, wiki_http.network_errors()):
+            self.error.emit(f"Network error: {str(e)}", generation)
+        else:
+            self.error.emit(str(e), generation)
 
 class WikipediaSearchGUI(QMainWindow):
-    def __init__(self):
+    PAGED = "All (paged)"
+    
+    def __init__(self, debounce_ms=300, min_typeahead_chars=2, page_size=50, prefetch_pages=2,
+                 prefetch_summaries=10, max_cached_summaries=200, wikis=None):
         super().__init__()
         self.setWindowTitle("Wikipedia Article Search")
         self.setMinimumSize(800, 600)
         
+        # Repeated queries are answered from here instead of the network
+        self.search_cache = SearchCache()
+        
+        # One asyncio loop thread serves every search, page and fetch
+        self.search_engine = SearchEngine()
+        self.search_bridge = SearchBridge(self.search_engine, self.search_cache, self)
+        self.search_bridge.finished.connect(self.on_search_finished)
+        self.search_bridge.page_ready.connect(self.on_page_ready)
+        self.search_bridge.paged_done.connect(self.on_paged_search_done)
+        self.search_bridge.error.connect(self.on_search_error)
+        self.search_bridge.offline_finished.connect(self.on_offline_finished)
+        self.search_bridge.federated_result.connect(self.on_federated_result)
+        self.search_bridge.federated_done.connect(self.on_federated_done)
+        self.search_bridge.summaries_ready.connect(self.on_summaries_ready)
+        self.search_bridge.summaries_failed.connect(self.on_summaries_failed)
+        
+        # Wikis searched at once when "All wikis" is ticked
+        self.wikis = list(wikis) if wikis else parse_wikis(DEFAULT_WIKIS)
+        self.wikis_by_name = {wiki.name: wiki for wiki in self.wikis}
+        self.federated_answers = []
+        self.federated_replace = False
+        
+        # Preview summaries of the top results are fetched ahead of selection,
+        # keyed by (source wiki, title)
+        self.prefetch_summaries = prefetch_summaries
+        self.summary_cache = LRUCache(max_cached_summaries)
+        self.summaries_pending = set()
+        
+        # Local dump index, used on demand or when Wikipedia can't be reached
+        self.offline_index = OfflineIndex()
+        self.offline_reason = None
+        
+        # Every title seen so far, for instant prefix matches while a search runs.
+        # Read off the GUI thread: at 300k titles that takes as long as startup.
+        self.title_index = TitleIndex()
+        self.search_bridge.title_index_read.connect(self.title_index.load)
+        self.search_bridge.read_title_index(self.title_index)
+        
+        # Search-as-you-type state: each search gets a new generation and
+        # results from older generations are ignored.
+        self.min_typeahead_chars = min_typeahead_chars
+        self.search_generation = 0
+        self.search_future = None
+        self.paged_search = None
+        
+        # Local/remote race bookkeeping and time-to-first-result of the current search
+        self.current_query = ""
+        self.current_limit = 10  # read from the combo when a search starts; None when paged
+        self.remote_pending = False
+        self.provisional_articles = ResultSet()
+        self.search_started = time.perf_counter()
+        self.first_result_source = None
+        self.first_result_ms = None
+        
+        # Per-phase latency of the last searches, shown in the diagnostics panel
+        self.metrics = MetricsRecorder(counters=self.search_engine.single_flight.stats)
+        
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self.search_as_you_type)
+        
+        # Paged mode: list=search pages of `page_size`, fetched `prefetch_pages` ahead
+        self.page_size = page_size
+        self.prefetch_pages = prefetch_pages
+        
         # Create central widget and main layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -86,20 +312,20 @@ class WikipediaSearchGUI(QMainWindow):
         
         # Title
         title_label = QLabel("Wikipedia Search Tool")
+        title_label.setObjectName("titleLabel")
         title_label.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        title_label.setStyleSheet("color: navy;")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         main_layout.addWidget(title_label)
         
         # Search section
         search_frame = QFrame()
-        search_frame.setStyleSheet("QFrame { background-color: lightblue; border: 2px solid gray; }")
+        search_frame.setObjectName("searchFrame")
         search_layout = QVBoxLayout(search_frame)
         
         # Search label
         search_label = QLabel("🔍 Enter your search term below:")
+        search_label.setObjectName("searchLabel")
         search_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        search_label.setStyleSheet("color: darkblue;")
         search_layout.addWidget(search_label)
         
         # Search input area
@@ -107,23 +333,7 @@ class WikipediaSearchGUI(QMainWindow):
         
         # Search entry with modern styling
         self.search_entry = QLineEdit()
-        self.search_entry.setStyleSheet("""
-            QLineEdit {
-                background-color: #1A237E;
-                color: white;
-                padding: 12px;
-                font-size: 16px;
-                border: none;
-                border-radius: 8px;
-            }
-            QLineEdit:focus {
-                background-color: #283593;
-                border: 2px solid #3949AB;
-            }
-            QLineEdit::placeholder {
-                color: #9FA8DA;
-            }
-        """)
+        self.search_entry.setObjectName("searchEntry")
         self.search_entry.setPlaceholderText("Search Wikipedia...")
         input_layout.addWidget(self.search_entry)
         
@@ -133,35 +343,37 @@ class WikipediaSearchGUI(QMainWindow):
         input_layout.addWidget(limit_label)
         
         self.limit_combo = QComboBox()
-        self.limit_combo.addItems(["5", "10", "15", "20"])
+        self.limit_combo.addItems(["5", "10", "15", "20", self.PAGED])
         self.limit_combo.setCurrentText("10")
         self.limit_combo.setFont(QFont("Arial", 12))
         input_layout.addWidget(self.limit_combo)
         
+        self.typeahead_check = QCheckBox("Search as you type")
+        self.typeahead_check.setFont(QFont("Arial", 12))
+        self.typeahead_check.setChecked(True)
+        input_layout.addWidget(self.typeahead_check)
+        
+        self.offline_check = QCheckBox("Offline")
+        self.offline_check.setFont(QFont("Arial", 12))
+        self.offline_check.setToolTip("Search the local Wikipedia dump (see --ingest)")
+        input_layout.addWidget(self.offline_check)
+        
+        self.federated_check = QCheckBox("All wikis")
+        self.federated_check.setFont(QFont("Arial", 12))
+        self.federated_check.setToolTip("Search " + ", ".join(self.wikis_by_name) + " at once")
+        input_layout.addWidget(self.federated_check)
+        
+        self.diagnostics_check = QCheckBox("Diagnostics")
+        self.diagnostics_check.setFont(QFont("Arial", 12))
+        self.diagnostics_check.setToolTip("Show search latency by phase")
+        input_layout.addWidget(self.diagnostics_check)
+        
         search_layout.addLayout(input_layout)
         
         # Search button with modern styling
         self.search_btn = QPushButton("Search")
+        self.search_btn.setObjectName("searchButton")
         self.search_btn.setFont(QFont("Arial", 14))
-        self.search_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498DB;
-                color: white;
-                padding: 10px 30px;
-                border: none;
-                border-radius: 8px;
-                min-width: 100px;
-            }
-            QPushButton:hover {
-                background-color: #2980B9;
-            }
-            QPushButton:pressed {
-                background-color: #2471A3;
-            }
-            QPushButton:disabled {
-                background-color: #BDC3C7;
-            }
-        """)
         search_layout.addWidget(self.search_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         
         # Progress bar
@@ -171,63 +383,348 @@ class WikipediaSearchGUI(QMainWindow):
         
         # Status label with modern styling
         self.status_label = QLabel("Enter your search term above")
+        self.status_label.setObjectName("statusLabel")
         self.status_label.setFont(QFont("Arial", 12))
-        self.status_label.setStyleSheet("color: #7F8C8D;")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         search_layout.addWidget(self.status_label)
         
         main_layout.addWidget(search_frame)
         
-        # Results area
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(3)
-        self.results_table.setHorizontalHeaderLabels(['Title', 'Description', 'Link'])
-        self.results_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        self.results_table.setStyleSheet("""
-            QTableWidget {
-                background-color: #F8F9FA;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QTableWidget::item {
-                padding: 10px;
-            }
-            QTableWidget::item:hover {
-                background-color: #E9ECEF;
-            }
-        """)
-        main_layout.addWidget(self.results_table)
+        # Results area. The table and preview pane are only built once there
+        # is something to show (see results_view), which keeps them off the
+        # startup path.
+        self.results_model = ResultsTableModel(self)
+        self.results_table = None
+        self.preview_pane = None
+        self.results_area = QVBoxLayout()
+        self.results_area.setContentsMargins(0, 0, 0, 0)
+        main_layout.addLayout(self.results_area, 1)
+        
+        # Diagnostics panel, built the first time it is shown
+        self.metrics_panel = None
+        self.main_layout = main_layout
+        self.diagnostics_check.toggled.connect(self.show_diagnostics)
         
         # Connect signals
         self.search_btn.clicked.connect(self.search_articles)
         self.search_entry.returnPressed.connect(self.search_articles)
+        self.search_entry.textChanged.connect(self.on_text_changed)
         
         # Show initial instructions
         self.show_instructions()
         
+    def results_view(self):
+        """The results table, created with the preview pane on first use"""
+        if self.results_table is not None:
+            return self.results_table
+            
+        self.link_delegate = LinkButtonDelegate(self)
+        self.link_delegate.clicked.connect(self.open_url)
+        self.results_table = QTableView()
+        self.results_table.setObjectName("resultsTable")
+        self.results_table.setModel(self.results_model)
+        self.results_table.setItemDelegateForColumn(ResultsTableModel.LINK, self.link_delegate)
+        self.results_table.setMouseTracking(True)  # hover state for the link delegate
+        self.results_table.verticalHeader().setDefaultSectionSize(40)
+        self.results_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.results_table.setColumnWidth(0, 200)
+        self.results_table.setColumnWidth(2, 100)
+        self.results_table.setColumnWidth(ResultsTableModel.SOURCE, 120)
+        self.results_table.setColumnHidden(ResultsTableModel.SOURCE, True)
+        self.results_table.selectionModel().currentRowChanged.connect(self.on_result_selected)
+        self.results_table.verticalScrollBar().valueChanged.connect(self.on_results_scrolled)
+        
+        # Results on the left, preview of the selected article on the right
+        self.preview_pane = PreviewPane()
+        results_splitter = QSplitter(Qt.Orientation.Horizontal)
+        results_splitter.addWidget(self.results_table)
+        results_splitter.addWidget(self.preview_pane)
+        results_splitter.setStretchFactor(0, 3)
+        results_splitter.setStretchFactor(1, 1)
+        self.results_area.addWidget(results_splitter)
+        return self.results_table
+        
+    def show_diagnostics(self, visible):
+        if self.metrics_panel is None:
+            if not visible:
+                return
+            from metrics_panel import MetricsPanel
+            self.metrics_panel = MetricsPanel(self.metrics)
+            self.main_layout.addWidget(self.metrics_panel)
+        self.metrics_panel.setVisible(visible)
+        
     def show_instructions(self):
-        self.results_table.setRowCount(0)  # Clear table
+        self.results_model.clear()
         self.status_label.setText("Start typing to search Wikipedia articles")
 
+    def on_text_changed(self, text):
+        """Restart the debounce timer on every keystroke"""
+        if not self.typeahead_check.isChecked():
+            return
+        if not text.strip():
+            self.debounce_timer.stop()
+            self.cancel_search()
+            self.search_btn.setEnabled(True)
+            self.search_btn.setText("🔍 Search")
+            self.progress.setVisible(False)
+            self.show_instructions()
+            return
+        self.debounce_timer.start()
+        
+    def search_as_you_type(self):
+        if len(self.search_entry.text().strip()) >= self.min_typeahead_chars:
+            self.search_articles()
+            
+    def cancel_search(self):
+        """Invalidate the current search so its results are dropped"""
+        self.search_generation += 1
+        if self.search_future is not None:
+            self.search_future.cancel()
+            self.search_future = None
+        self.paged_search = None
+        
     def search_articles(self):
+        self.debounce_timer.stop()
         query = self.search_entry.text().strip()
         if not query:
             self.status_label.setText("❌ Please enter a search term!")
             return
             
-        # Add a small delay before starting new search
-        QThread.msleep(1000)  # 1 second delay
+        self.cancel_search()
+        generation = self.search_generation
+        self.current_query = query
+        self.current_limit = None if self.is_paged_mode() else int(self.limit_combo.currentText())
+        self.offline_reason = None
+        self.remote_pending = False
+        self.provisional_articles = ResultSet()
+        self.search_started = time.perf_counter()
+        self.first_result_source = None
+        federated = self.federated_check.isChecked() and not self.offline_check.isChecked()
+        if self.results_table is not None:
+            self.results_table.setColumnHidden(ResultsTableModel.SOURCE, not federated)
+        if self.offline_check.isChecked():
+            self.start_offline_search(query, generation)
+            return
+        if federated:
+            self.start_federated_search(query, generation)
+            return
+        if self.current_limit is None:
+            self.start_paged_search(query, generation)
+            return
+            
+        limit = self.current_limit
+        cached = self.search_cache.get(query, limit)
+        if cached is not None:
+            self.note_first_result("cache")
+            self.display_results(cached, query)
+            stats = self.search_cache.stats()
+            self.status_label.setText(
+                f"✅ Found {len(cached)} articles (cached, "
+                f"{stats['hits']} hits / {stats['misses']} misses)")
+            return
             
         self.search_btn.setEnabled(False)
         self.search_btn.setText("🔍 Searching...")
         self.progress.setVisible(True)
         self.status_label.setText("🔍 Searching Wikipedia...")
-        self.results_table.setRowCount(0)
         
-        self.search_thread = SearchThread(query, int(self.limit_combo.currentText()))
-        self.search_thread.finished.connect(self.display_results)
-        self.search_thread.error.connect(self.show_error)
-        self.search_thread.start()
+        # Race the local sources against the API: whatever answers first is
+        # shown, the API's answer then replaces it with a minimal row diff.
+        # The previous rows stay until then, so refining a query doesn't blank
+        # the table.
+        self.remote_pending = True
+        self.search_future = self.search_bridge.search(query, limit, generation)
+        if self.offline_index.article_count():
+            self.search_bridge.offline_search(self.offline_index, query, limit, generation)
+        self.show_provisional(self.title_index.prefix(query, limit), "title index")
+        
+    def show_provisional(self, articles, source):
+        """Show local matches while the authoritative API answer is pending"""
+        if not articles or not self.remote_pending:
+            return
+        self.provisional_articles = merge_articles(
+            self.provisional_articles, articles, self.current_limit)
+        self.note_first_result(source)
+        self.populate_table(self.provisional_articles.copy())
+        self.status_label.setText(
+            f"🔍 Showing {len(self.provisional_articles)} known articles, searching Wikipedia...")
+        
+    def note_first_result(self, source):
+        """Log time-to-first-result for the current search"""
+        if self.first_result_source is not None:
+            return
+        self.first_result_source = source
+        self.first_result_ms = (time.perf_counter() - self.search_started) * 1000
+        log.info("first result for %r after %.1f ms from %s",
+                 self.current_query, self.first_result_ms, source)
+        
+    def start_offline_search(self, query, generation, reason=None):
+        """Search the local dump index; `reason` explains an automatic fallback"""
+        self.offline_reason = reason
+        limit = 500 if self.current_limit is None else self.current_limit
+        self.search_btn.setEnabled(False)
+        self.search_btn.setText("🔍 Searching...")
+        self.progress.setVisible(True)
+        self.status_label.setText("🔍 Searching offline index...")
+        self.paged_search = None
+        self.search_future = self.search_bridge.offline_search(
+            self.offline_index, query, limit, generation)
+        
+    def on_offline_finished(self, articles, query, generation):
+        if generation != self.search_generation:
+            return
+        if self.remote_pending:
+            # Racing the API: a provisional answer only
+            self.show_provisional(articles, "offline index")
+            return
+        self.note_first_result("offline index")
+        self.display_results(articles, query)
+        if articles:
+            status = f"📴 Found {len(articles)} articles offline"
+            if self.offline_reason:
+                status += f" ({self.offline_reason})"
+            self.status_label.setText(status)
+        
+    def is_paged_mode(self):
+        return self.limit_combo.currentText() == self.PAGED
+        
+    def start_paged_search(self, query, generation):
+        self.search_btn.setEnabled(False)
+        self.search_btn.setText("🔍 Searching...")
+        self.progress.setVisible(True)
+        self.status_label.setText("🔍 Searching Wikipedia...")
+        self.results_model.clear()
+        
+        self.paged_search, self.search_future = self.search_bridge.paged_search(
+            query, self.page_size, self.prefetch_pages, generation)
+        
+    def on_page_ready(self, articles, total_hits, generation):
+        self.title_index.add(articles)
+        if generation != self.search_generation:
+            return
+        first_page = self.results_model.rowCount() == 0
+        self.note_first_result("api")
+        # Append in place so the scroll position and selection are kept
+        self.results_view()
+        self.results_model.append_articles(articles)
+        if first_page:
+            self.prefetch_article_summaries(articles)
+        loaded = self.results_model.rowCount()
+        self.search_btn.setEnabled(True)
+        self.search_btn.setText("🔍 Search")
+        self.progress.setVisible(False)
+        self.status_label.setText(f"✅ Loaded {loaded} of {total_hits} articles, scroll for more")
+        # Keep fetching while the loaded rows don't fill the view yet
+        self.on_results_scrolled(self.results_table.verticalScrollBar().value())
+        
+    def on_paged_search_done(self, loaded, generation):
+        if generation != self.search_generation:
+            return
+        self.search_btn.setEnabled(True)
+        self.search_btn.setText("🔍 Search")
+        self.progress.setVisible(False)
+        if loaded:
+            self.status_label.setText(f"✅ Loaded all {loaded} articles")
+        else:
+            self.status_label.setText("❌ No results found")
+        
+    def start_federated_search(self, query, generation):
+        """Fan the query out to every configured wiki; rows stream in per wiki"""
+        limit = self.page_size if self.current_limit is None else self.current_limit
+        self.search_btn.setEnabled(False)
+        self.search_btn.setText("🔍 Searching...")
+        self.progress.setVisible(True)
+        self.status_label.setText(f"🔍 Searching {len(self.wikis)} wikis...")
+        self.paged_search = None
+        self.federated_answers = []
+        self.federated_replace = True
+        self.search_future = self.search_bridge.federated_search(query, self.wikis, limit, generation)
+        
+    def on_federated_result(self, wiki, articles, error, generation, timing):
+        if generation != self.search_generation:
+            return
+        self.federated_answers.append((wiki.name, timing.phases['total'], error))
+        if articles is not None:
+            self.note_first_result(wiki.name)
+            start = time.perf_counter()
+            self.results_view().setColumnHidden(ResultsTableModel.SOURCE, False)
+            if self.federated_replace:
+                # The previous search's rows stay until the first wiki answers
+                self.results_model.set_articles(articles)
+                self.federated_replace = False
+            else:
+                self.results_model.append_articles(articles)
+            timing.add('render', (time.perf_counter() - start) * 1000)
+            self.prefetch_article_summaries(articles)
+        self.metrics.record(timing)
+        if self.metrics_panel is not None:
+            self.metrics_panel.refresh()
+        self.status_label.setText(
+            f"🔍 {len(self.federated_answers)} of {len(self.wikis)} wikis answered, "
+            f"{self.results_model.rowCount()} articles so far...")
+        
+    def on_federated_done(self, generation):
+        if generation != self.search_generation:
+            return
+        self.search_btn.setEnabled(True)
+        self.search_btn.setText("🔍 Search")
+        self.progress.setVisible(False)
+        failed = [(name, error) for name, _, error in self.federated_answers if error]
+        if len(failed) == len(self.federated_answers):
+            self.show_error("; ".join(f"{name}: {error}" for name, error in failed))
+            return
+        latencies = ", ".join(f"{name} {ms:.0f} ms" if not error else f"{name} failed"
+                              for name, ms, error in self.federated_answers)
+        rows = self.results_model.rowCount()
+        if rows:
+            status = f"✅ Found {rows} articles on {len(self.federated_answers) - len(failed)} wikis"
+        else:
+            status = "❌ No results found"
+        self.status_label.setText(f"{status} ({latencies})")
+        for name, error in failed:
+            log.warning("federated search on %s failed: %s", name, error)
+        
+    def on_results_scrolled(self, value):
+        """Ask the paged search for more rows once the view nears its end"""
+        if self.paged_search is None or self.results_table is None:
+            return
+        scrollbar = self.results_table.verticalScrollBar()
+        if scrollbar.maximum() - value <= scrollbar.pageStep() * 2:
+            self.paged_search.request_more()
+            
+    def on_search_finished(self, articles, query, generation, timing):
+        self.title_index.add(articles)
+        if generation != self.search_generation:
+            return
+        self.remote_pending = False
+        self.note_first_result("api")
+        log.info("api result for %r after %.1f ms (first result %.1f ms from %s)",
+                 query, (time.perf_counter() - self.search_started) * 1000,
+                 self.first_result_ms, self.first_result_source)
+        start = time.perf_counter()
+        self.display_results(self.merge_local_results(articles, query), query)
+        timing.add('render', (time.perf_counter() - start) * 1000)
+        self.metrics.record(timing.finish())
+        if self.metrics_panel is not None:
+            self.metrics_panel.refresh()
+            
+    def merge_local_results(self, articles, query):
+        """Live results first, topped up with local prefix matches up to the limit"""
+        limit = self.current_limit
+        if len(articles) >= limit:
+            return articles
+        return merge_articles(articles, self.title_index.prefix(query, limit), limit)
+            
+    def on_search_error(self, error_msg, generation):
+        if generation != self.search_generation:
+            return
+        self.remote_pending = False
+        # Fall back to the local dump once; an offline failure is shown as is
+        falling_back = self.offline_reason is not None or self.offline_check.isChecked()
+        if not falling_back and self.offline_index.article_count():
+            self.start_offline_search(self.current_query, generation, reason=error_msg)
+            return
+        self.show_error(error_msg)
         
     def display_results(self, articles, query):
         try:
@@ -237,61 +734,80 @@ class WikipediaSearchGUI(QMainWindow):
             
             if not articles:
                 self.status_label.setText("❌ No results found")
-                self.results_table.setRowCount(0)
+                self.results_model.clear()
                 return
                     
             self.status_label.setText(f"✅ Found {len(articles)} articles")
-            self.results_table.setRowCount(len(articles))
-            
-            for i, article in enumerate(articles):
-                # Title
-                title_item = QTableWidgetItem(article.get('title', 'No title'))
-                title_item.setFlags(title_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.results_table.setItem(i, 0, title_item)
-                
-                # Description
-                desc_item = QTableWidgetItem(article.get('description', 'No description'))
-                desc_item.setFlags(desc_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.results_table.setItem(i, 1, desc_item)
-                
-                # Link - Updated implementation
-                url = article.get('url', '')
-                link_item = QPushButton("🔗 Open")
-                link_item.setStyleSheet("""
-                    QPushButton {
-                        background-color: #3498DB;
-                        color: white;
-                        border: none;
-                        border-radius: 4px;
-                        padding: 5px;
-                    }
-                    QPushButton:hover {
-                        background-color: #2980B9;
-                    }
-                """)
-                
-                if url:
-                    # Use a lambda with default argument to capture the current URL
-                    link_item.clicked.connect(lambda checked, u=url: self.open_url(u))
-                else:
-                    link_item.setEnabled(False)
-                    
-                self.results_table.setCellWidget(i, 2, link_item)
-                
-            # Adjust column widths
-            self.results_table.setColumnWidth(0, 200)
-            self.results_table.setColumnWidth(2, 100)
+            self.populate_table(articles)
+            self.prefetch_article_summaries(articles)
             
         except Exception as e:
             self.show_error(f"Failed to display results: {str(e)}")
             
+    def populate_table(self, articles):
+        self.results_view()
+        self.results_model.update_articles(articles)
+        
+    def prefetch_article_summaries(self, articles):
+        """Fetch previews for the first results not cached or already on the way,
+        one batched request per source wiki
+        """
+        titles_by_source = {}
+        for i in range(min(len(articles), self.prefetch_summaries)):
+            key = (articles.source(i), articles.title(i))
+            if key[1] and key not in self.summary_cache and key not in self.summaries_pending:
+                self.summaries_pending.add(key)
+                titles_by_source.setdefault(key[0], []).append(key[1])
+        batch = wiki_api.MAX_SUMMARY_TITLES
+        for source, titles in titles_by_source.items():
+            for start in range(0, len(titles), batch):
+                self.search_bridge.fetch_summaries(titles[start:start + batch],
+                                                   wiki=self.wikis_by_name.get(source))
+            
+    def selected_key(self):
+        """(source, title) of the selected row"""
+        if self.results_table is None:
+            return None
+        index = self.results_table.selectionModel().currentIndex()
+        if not index.isValid():
+            return None
+        return self.results_model.source(index.row()), self.results_model.title(index.row())
+        
+    def on_result_selected(self, current, previous):
+        if not current.isValid():
+            return
+        key = (self.results_model.source(current.row()), self.results_model.title(current.row()))
+        summary = self.summary_cache.get(key)
+        if summary is not None:
+            self.preview_pane.show_summary(summary, summary.get('image'))
+            return
+        self.preview_pane.show_message("Loading preview...", key[1])
+        # Fetch this row and the ones after it, the likely next selections
+        articles = self.results_model.articles()
+        self.prefetch_article_summaries(articles[current.row():current.row() + self.prefetch_summaries])
+        
+    def on_summaries_ready(self, source, summaries):
+        for title, summary in summaries.items():
+            self.summaries_pending.discard((source, title))
+            self.summary_cache.put((source, title), summary)
+        selected = self.selected_key()
+        if selected is not None and selected[0] == source and selected[1] in summaries:
+            summary = summaries[selected[1]]
+            self.preview_pane.show_summary(summary, summary.get('image'))
+            
+    def on_summaries_failed(self, source, titles, error_msg):
+        self.summaries_pending.difference_update((source, title) for title in titles)
+        selected = self.selected_key()
+        if selected is not None and selected[0] == source and selected[1] in titles:
+            self.preview_pane.show_message(f"Preview unavailable: {error_msg}", selected[1])
+            
     def show_error(self, error_msg):
         self.search_btn.setEnabled(True)
         self.search_btn.setText("🔍 Search")
         self.progress.setVisible(False)
         self.status_label.setText(f"❌ Error: {error_msg}")
-        print(f"Error occurred: {error_msg}")  # Debug output
-        self.results_table.setRowCount(0)
+        log.error("search failed: %s", error_msg)
+        self.results_model.clear()
 
     def open_url(self, url):
         """Helper method to open URLs safely"""
@@ -300,8 +816,45 @@ class WikipediaSearchGUI(QMainWindow):
         except Exception as e:
             self.show_error(f"Failed to open URL: {str(e)}")
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = WikipediaSearchGUI()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="wiki-search", description="Search Wikipedia articles.")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run headless: search every line of FILE ('-' for stdin) and print results")
+    parser.add_argument("--ingest", metavar="DUMP",
+                        help="add a Wikipedia abstracts/titles dump to the offline index and exit")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl",
+                        help="batch output format (default: jsonl)")
+    parser.add_argument("--limit", type=int, default=10, help="results per query (default: 10)")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent batch requests (default: 8)")
+    parser.add_argument("--rate", type=float, default=wiki_http.get_config().requests_per_second,
+                        help="maximum requests per second to each wiki")
+    parser.add_argument("--wikis", default=",".join(DEFAULT_WIKIS),
+                        help="comma-separated hosts or api.php URLs searched by \"All wikis\" "
+                             "(default: %(default)s)")
+    # Qt options such as -style are passed through to QApplication
+    return parser.parse_known_args(argv)
+
+
+def main(argv=None):
+    args, qt_args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
+    if args.batch:
+        import batch
+        return batch.main(args)
+    if args.ingest:
+        import offline_index
+        return offline_index.main(args)
+    
+    app = QApplication(sys.argv[:1] + qt_args)
+    app.setStyleSheet(STYLESHEET)
+    window = WikipediaSearchGUI(wikis=parse_wikis(args.wikis))
+    app.aboutToQuit.connect(window.search_engine.stop)
+    app.aboutToQuit.connect(wiki_http.close_session)
+    app.aboutToQuit.connect(window.search_cache.close)
+    app.aboutToQuit.connect(window.offline_index.close)
+    app.aboutToQuit.connect(window.title_index.save)
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    return app.exec()
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,18 @@
+import os
+import sys
+from pathlib import Path
+
+APP_NAME = "WikiSearch"
+
+
+def cache_dir():
+    """Per-user cache directory for WikiSearch, created on demand"""
+    if sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    elif sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    path = base / APP_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,163 @@
+"""Headless batch search: resolve many queries concurrently without Qt.
+
+    wiki-search --batch queries.txt --format csv > results.csv
+    cat queries.txt | wiki-search --batch - --workers 16 --rate 10
+"""
+import asyncio
+import csv
+import json
+import sys
+import time
+
+import requests
+
+import wiki_http
+from results import ResultSet
+from search_engine import SearchEngine
+from search_metrics import REQUEST_PHASES, SearchTiming, percentile
+
+CSV_FIELDS = ('query', 'rank', 'title', 'description', 'url', 'error')
+
+
+def read_queries(source):
+    """Yield non-empty, stripped lines from a path or '-' for stdin"""
+    f = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        for line in f:
+            query = line.strip()
+            if query:
+                yield query
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+async def search_one(engine, query, limit):
+    """Run one opensearch query; returns (query, articles, error, SearchTiming)"""
+    timing = SearchTiming(query)
+    try:
+        articles = await engine.opensearch(query, limit, timing=timing)
+        error = None
+    except requests.exceptions.RequestException as e:
+        articles, error = ResultSet(), f"Network error: {str(e)}"
+    except Exception as e:
+        articles, error = ResultSet(), str(e)
+    return query, articles, error, timing.finish()
+
+
+def request_ms(timing):
+    """Connect through parse: the request itself, without the time spent
+    waiting for a concurrency slot or on the rate limiter
+    """
+    return sum(timing.phases[phase] for phase in REQUEST_PHASES if phase != 'rate_limit')
+
+
+class JsonlWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, query, articles, error, seconds):
+        record = {'query': query, 'articles': articles.to_dicts(), 'error': error,
+                  'elapsed_ms': round(seconds * 1000, 2)}
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+
+class CsvWriter:
+    def __init__(self, out):
+        self.out = out
+        self.writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, query, articles, error, seconds):
+        if error or not articles:
+            self.writer.writerow({'query': query, 'error': error or ''})
+        for rank, article in enumerate(articles.to_dicts(), 1):
+            self.writer.writerow({'query': query, 'rank': rank, **article, 'error': ''})
+        self.out.flush()
+
+
+WRITERS = {'jsonl': JsonlWriter, 'csv': CsvWriter}
+
+
+def run_batch(queries, limit=10, workers=8, fmt='jsonl', out=None, report=sys.stderr):
+    """Search every query with at most `workers` requests in flight and stream
+    results in completion order. Requests go through the asyncio SearchEngine,
+    so they share the pooled session and the global rate limiter in wiki_http.
+    Returns a summary dict.
+    """
+    writer = WRITERS[fmt](out if out is not None else sys.stdout)
+    engine = SearchEngine(max_concurrency=workers)
+    start = time.perf_counter()
+    try:
+        latencies, waits, errors = asyncio.run(_run_all(engine, queries, limit, workers, writer))
+    finally:
+        engine.stop()
+
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    waits.sort()
+    summary = {
+        'queries': len(latencies),
+        'errors': errors,
+        'seconds': elapsed,
+        'queries_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        # Per request; the time queued behind the other workers and the rate
+        # limiter is reported apart, it mostly reflects the backlog
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'wait_p50_ms': percentile(waits, 50),
+        'wait_p95_ms': percentile(waits, 95),
+        # Repeated queries in flight together were answered by one request
+        'coalesced': engine.single_flight.coalesced,
+    }
+    if report is not None:
+        coalesced = f", {summary['coalesced']} duplicates coalesced" if summary['coalesced'] else ""
+        report.write(
+            f"{summary['queries']} queries ({errors} errors) in {elapsed:.2f}s: "
+            f"{summary['queries_per_second']:.1f} queries/s, "
+            f"request p50 {summary['p50_ms']:.0f} ms, p95 {summary['p95_ms']:.0f} ms, "
+            f"queued p50 {summary['wait_p50_ms']:.0f} ms, p95 {summary['wait_p95_ms']:.0f} ms"
+            f"{coalesced}\n")
+    return summary
+
+
+async def _run_all(engine, queries, limit, workers, writer):
+    latencies, waits = [], []
+    errors = 0
+    pending = set()
+    for query in queries:
+        pending.add(asyncio.ensure_future(search_one(engine, query, limit)))
+        # Bound the backlog so huge inputs are streamed, not all queued up front
+        if len(pending) >= workers * 4:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                errors += _emit(writer, task.result(), latencies, waits)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            errors += _emit(writer, task.result(), latencies, waits)
+    return latencies, waits, errors
+
+
+def _emit(writer, result, latencies, waits):
+    query, articles, error, timing = result
+    total = timing.phases['total']
+    writer.write(query, articles, error, total / 1000)
+    latencies.append(request_ms(timing))
+    waits.append(total - request_ms(timing))
+    return 1 if error else 0
+
+
+def main(args):
+    """Entry point for `wiki-search --batch`; `args` comes from app.main's parser"""
+    wiki_http.configure(wiki_http.HttpClientConfig(
+        pool_maxsize=max(10, args.workers),
+        requests_per_second=args.rate,
+        burst=max(1, int(args.rate)),
+    ))
+    try:
+        summary = run_batch(read_queries(args.batch), args.limit, args.workers, args.format)
+    finally:
+        wiki_http.close_session()
+    return 1 if summary['errors'] else 0
@@ -0,0 +1,96 @@
+"""The pooled requests.Session behind wiki_http.
+
+Kept apart from wiki_http so that importing wiki_http (and with it the GUI)
+does not import requests and urllib3; wiki_http loads this module when the
+first request needs a session.
+"""
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+import search_metrics
+
+
+class _TimedConnectionMixin:
+    """Reports socket connect and TLS handshake time to the SearchTiming of
+    the request running on this thread (see search_metrics.set_current)"""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self._socket_ms = (time.perf_counter() - start) * 1000
+
+    def connect(self):
+        self._socket_ms = 0.0
+        start = time.perf_counter()
+        super().connect()
+        timing = search_metrics.current()
+        if timing is not None:
+            timing.add('connect', self._socket_ms)
+            timing.add('tls', (time.perf_counter() - start) * 1000 - self._socket_ms)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections report connect/TLS timings"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class _Retry(Retry):
+    """urllib3 retries that leave HTTP 429 alone: wiki_http answers those by
+    deferring the host's rate limiter by Retry-After (up to max_retry_after),
+    rather than sleeping on an executor thread"""
+
+    RETRY_AFTER_STATUS_CODES = Retry.RETRY_AFTER_STATUS_CODES - {429}
+
+
+def create_session(config):
+    """Build a requests.Session with pooled keep-alive connections and retries"""
+    retry = _Retry(
+        total=config.max_retries,
+        connect=config.max_retries,
+        read=config.max_retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = TimedHTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers.update(config.headers)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
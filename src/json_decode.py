@@ -0,0 +1,186 @@
+"""JSON decoding of API responses with the fastest decoder available.
+
+msgspec decodes opensearch and list=search responses straight into typed
+structs holding just the fields we read; orjson and the stdlib json module
+decode the whole document into Python objects. All three return the same
+shapes, so callers don't care which one is in use.
+
+The backend is chosen once, at import: msgspec, then orjson, then json.
+WIKISEARCH_JSON=json|orjson|msgspec (or set_backend()) picks one explicitly.
+Invalid or unexpected documents raise ValueError with every backend.
+"""
+import json
+import logging
+import os
+from collections import namedtuple
+
+log = logging.getLogger(__name__)
+
+BACKENDS = ('msgspec', 'orjson', 'json')
+
+# What decode_search_page() returns. `error` is the API's error message
+# (everything else is empty then); next_offset is None on the last page.
+SearchPage = namedtuple('SearchPage', 'titles snippets next_offset total_hits error')
+
+
+def _error_info(data):
+    error = data['error']
+    return (error.get('info') if isinstance(error, dict) else None) or 'Wikipedia API error'
+
+
+# Generic backends: decode everything, then pick the fields out
+
+class _GenericDecoder:
+    def __init__(self, loads):
+        self.loads = loads
+
+    def opensearch(self, content):
+        data = self.loads(content)
+        if not isinstance(data, list) or len(data) < 4:
+            raise ValueError("not an opensearch response")
+        return data[1], data[2]
+
+    def search_page(self, content):
+        data = self.loads(content)
+        if not isinstance(data, dict):
+            raise ValueError("not a list=search response")
+        if 'error' in data:
+            return SearchPage([], [], None, 0, _error_info(data))
+        if 'query' not in data:
+            raise ValueError("not a list=search response")
+        hits = data['query'].get('search', [])
+        return SearchPage([hit.get('title', '') for hit in hits],
+                          [hit.get('snippet', '') for hit in hits],
+                          data.get('continue', {}).get('sroffset'),
+                          data['query'].get('searchinfo', {}).get('totalhits', len(hits)),
+                          None)
+
+
+def _stdlib_decoder():
+    return _GenericDecoder(json.loads)
+
+
+def _orjson_decoder():
+    import orjson
+    return _GenericDecoder(orjson.loads)
+
+
+# msgspec: typed decoding, fields we don't read are skipped by the parser
+
+def _msgspec_decoder():
+    import msgspec
+    from typing import List, Optional
+
+    class OpenSearch(msgspec.Struct, array_like=True):
+        query: str
+        titles: List[str]
+        descriptions: List[str]
+        urls: List[str]
+
+    class Hit(msgspec.Struct):
+        title: str = ''
+        snippet: str = ''
+
+    class SearchInfo(msgspec.Struct):
+        totalhits: Optional[int] = None
+
+    class Query(msgspec.Struct):
+        search: List[Hit] = []
+        searchinfo: SearchInfo = msgspec.field(default_factory=SearchInfo)
+
+    class Continue(msgspec.Struct):
+        sroffset: Optional[int] = None
+
+    class Page(msgspec.Struct):
+        query: Optional[Query] = None
+        continue_: Continue = msgspec.field(default_factory=Continue, name='continue')
+        error: Optional[dict] = None
+
+    class Decoder:
+        def __init__(self):
+            self.loads = msgspec.json.decode
+            self._opensearch = msgspec.json.Decoder(OpenSearch)
+            self._page = msgspec.json.Decoder(Page)
+
+        def opensearch(self, content):
+            result = self._opensearch.decode(content)
+            return result.titles, result.descriptions
+
+        def search_page(self, content):
+            page = self._page.decode(content)
+            if page.error is not None:
+                return SearchPage([], [], None, 0, _error_info({'error': page.error}))
+            if page.query is None:
+                raise ValueError("not a list=search response")
+            hits = page.query.search
+            total_hits = page.query.searchinfo.totalhits
+            return SearchPage([hit.title for hit in hits], [hit.snippet for hit in hits],
+                              page.continue_.sroffset,
+                              len(hits) if total_hits is None else total_hits,
+                              None)
+
+    return Decoder()
+
+
+_FACTORIES = {'msgspec': _msgspec_decoder, 'orjson': _orjson_decoder, 'json': _stdlib_decoder}
+
+_decoder = None
+_backend = None
+
+
+def available_backends():
+    """Names of the backends that can be used here, fastest first"""
+    names = []
+    for name in BACKENDS:
+        try:
+            _FACTORIES[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def set_backend(name=None):
+    """Switch to backend `name`, or to the fastest installed one when None.
+
+    Raises ImportError when the requested backend isn't installed.
+    """
+    global _decoder, _backend
+    if name is not None:
+        if name not in _FACTORIES:
+            raise ValueError(f"unknown JSON backend {name!r}, expected one of {BACKENDS}")
+        _decoder, _backend = _FACTORIES[name](), name
+        return name
+    for candidate in BACKENDS:
+        try:
+            _decoder, _backend = _FACTORIES[candidate](), candidate
+        except ImportError:
+            continue
+        return candidate
+
+
+def backend():
+    """Name of the backend in use"""
+    return _backend
+
+
+def loads(content):
+    """Any JSON document (bytes or str) as Python objects"""
+    return _decoder.loads(content)
+
+
+def decode_opensearch(content):
+    """(titles, descriptions) lists of an opensearch response body"""
+    return _decoder.opensearch(content)
+
+
+def decode_search_page(content):
+    """A SearchPage from an action=query&list=search response body"""
+    return _decoder.search_page(content)
+
+
+try:
+    set_backend(os.environ.get('WIKISEARCH_JSON') or None)
+except (ImportError, ValueError) as e:
+    log.warning("Ignoring WIKISEARCH_JSON: %s", e)
+    set_backend()
@@ -0,0 +1,86 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import (QFileDialog, QFrame, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QVBoxLayout, QHeaderView)
+
+from search_metrics import PHASES, QUANTILES
+
+
+class MetricsPanel(QFrame):
+    """Diagnostics: per-phase search latency percentiles over the recent searches,
+    and the total latency per wiki of federated searches
+    """
+
+    def __init__(self, recorder, parent=None):
+        super().__init__(parent)
+        self.recorder = recorder
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel()
+        self.summary_label.setFont(QFont("Arial", 12))
+        layout.addWidget(self.summary_label)
+
+        columns = [f"p{q} (ms)" for q in QUANTILES] + ["mean (ms)"]
+        self.table = QTableWidget(len(PHASES), len(columns))
+        self.table.setHorizontalHeaderLabels(columns)
+        self.table.setVerticalHeaderLabels(PHASES)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        self.endpoint_table = QTableWidget(0, len(columns))
+        self.endpoint_table.setHorizontalHeaderLabels(columns)
+        self.endpoint_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.endpoint_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.endpoint_table.setVisible(False)
+        layout.addWidget(self.endpoint_table)
+
+        buttons = QHBoxLayout()
+        export_json = QPushButton("Export JSON...")
+        export_json.clicked.connect(lambda: self.export("JSON (*.json)", self.recorder.to_json))
+        buttons.addWidget(export_json)
+        export_prom = QPushButton("Export Prometheus...")
+        export_prom.clicked.connect(lambda: self.export("Prometheus (*.prom *.txt)",
+                                                        self.recorder.to_prometheus))
+        buttons.addWidget(export_prom)
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    def refresh(self):
+        """Recompute the table from the recorder; cheap, but skipped while hidden"""
+        if not self.isVisible() and self.table.item(0, 0) is not None:
+            return
+        aggregates = self.recorder.aggregates()
+        summary = f"Last {len(self.recorder)} searches"
+        counters = self.recorder.counters()
+        if 'coalesced' in counters:
+            summary += (f" · {counters['requests']} API requests sent, "
+                        f"{counters['coalesced']} saved by joining identical searches in flight")
+        self.summary_label.setText(summary)
+        for row, phase in enumerate(PHASES):
+            self.set_row(self.table, row, aggregates[phase])
+
+        endpoints = self.recorder.endpoints()
+        self.endpoint_table.setRowCount(len(endpoints))
+        self.endpoint_table.setVerticalHeaderLabels([f"{source} total" for source in endpoints])
+        for row, stats in enumerate(endpoints.values()):
+            self.set_row(self.endpoint_table, row, stats)
+        self.endpoint_table.setVisible(bool(endpoints))
+
+    def set_row(self, table, row, stats):
+        values = [stats[f"p{q}"] for q in QUANTILES] + [stats['mean']]
+        for column, value in enumerate(values):
+            item = QTableWidgetItem(f"{value:.1f}")
+            item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            table.setItem(row, column, item)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def export(self, file_filter, render):
+        path, _ = QFileDialog.getSaveFileName(self, "Export search metrics", "", file_filter)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(render())
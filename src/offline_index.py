@@ -0,0 +1,196 @@
+"""Offline search over a local Wikipedia dump, backed by SQLite FTS5.
+
+Supported dumps (plain or .gz), both streamed rather than loaded in memory:
+
+* abstracts:  enwiki-latest-abstract.xml(.gz) with <doc><title>/<url>/<abstract>
+* titles:     enwiki-latest-all-titles-in-ns0(.gz), one title per line
+
+Ingest commits in batches together with how far it got, so an interrupted
+ingest resumes where it stopped and a finished dump is not ingested twice.
+
+    python src/app.py --ingest enwiki-latest-abstract.xml.gz
+"""
+import gzip
+import re
+import sqlite3
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+import app_paths
+from results import ResultSet, NO_DESCRIPTION
+from wiki_http import article_url
+
+BATCH_SIZE = 10_000
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _open_dump(path):
+    if str(path).endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_abstracts(path):
+    """Yield (title, description, url) from an abstracts XML dump"""
+    with _open_dump(path) as f:
+        context = ET.iterparse(f, events=('start', 'end'))
+        _, root = next(context)
+        for event, elem in context:
+            if event != 'end' or _local_name(elem.tag) != 'doc':
+                continue
+            title = elem.findtext('title') or ''
+            if title.startswith('Wikipedia: '):
+                title = title[len('Wikipedia: '):]
+            yield title, (elem.findtext('abstract') or '').strip(), elem.findtext('url') or ''
+            root.clear()  # drop parsed docs so memory stays flat
+
+
+def iter_titles(path):
+    """Yield (title, '', '') from an all-titles dump"""
+    with _open_dump(path) as f:
+        for i, line in enumerate(f):
+            title = line.decode('utf-8', 'replace').rstrip('\n')
+            if i == 0 and title == 'page_title':
+                continue  # header line
+            if title:
+                yield title.replace('_', ' '), '', ''
+
+
+def iter_dump(path):
+    name = str(path).lower()
+    if '.xml' in name:
+        return iter_abstracts(path)
+    return iter_titles(path)
+
+
+def fts_query(query):
+    """FTS5 MATCH expression: every word must match, the last one as a prefix"""
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    terms = [f'"{t}"' for t in tokens[:-1]]
+    terms.append(f'"{tokens[-1]}"*')
+    return " ".join(terms)
+
+
+class OfflineIndex:
+    """Local full-text index returning the same ResultSets as the online path"""
+
+    def __init__(self, db_path=None):
+        if db_path is None:
+            db_path = app_paths.cache_dir() / "offline_index.sqlite3"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles USING fts5(
+                title, description, url UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3 4'
+            );
+            CREATE TABLE IF NOT EXISTS ingest_state (
+                source TEXT PRIMARY KEY,
+                records INTEGER NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+        self._db.commit()
+        self._count = None
+
+    def article_count(self):
+        with self._lock:
+            if self._count is None:
+                # count(*) on FTS5 scans the index; the ingest bookkeeping is instant
+                self._count = self._db.execute(
+                    "SELECT coalesce(sum(records), 0) FROM ingest_state").fetchone()[0]
+            return self._count
+
+    def search(self, query, limit=10):
+        """Ranked matches, titles weighted well above descriptions"""
+        match = fts_query(query)
+        if match is None:
+            return ResultSet()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT title, description, url FROM articles WHERE articles MATCH ? "
+                "ORDER BY bm25(articles, 10.0, 1.0) LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        # Dumps carry their own URLs; only keep them if they aren't derivable
+        titles = [title for title, _, _ in rows]
+        descriptions = [description or NO_DESCRIPTION for _, description, _ in rows]
+        urls = [url or article_url(title) for title, _, url in rows]
+        if urls == [article_url(title) for title in titles]:
+            urls = None
+        return ResultSet(titles, descriptions, urls)
+
+    def ingest(self, path, progress=None):
+        """Stream a dump into the index, resuming after the last committed batch.
+
+        Returns the number of records added by this call.
+        """
+        source = str(path)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT records, complete FROM ingest_state WHERE source = ?", (source,)
+            ).fetchone()
+        done, complete = row if row else (0, 0)
+        if complete:
+            return 0
+
+        added = 0
+        batch = []
+        for i, record in enumerate(iter_dump(path)):
+            if i < done:
+                continue  # already ingested before an interruption
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                self._write_batch(source, batch, done + added + len(batch))
+                added += len(batch)
+                batch = []
+                if progress is not None:
+                    progress(done + added)
+        self._write_batch(source, batch, done + added + len(batch), complete=True)
+        added += len(batch)
+        if progress is not None:
+            progress(done + added)
+        return added
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _write_batch(self, source, batch, records, complete=False):
+        # Rows and progress are committed together, so a resume never duplicates rows
+        with self._lock, self._db:
+            self._db.executemany("INSERT INTO articles (title, description, url) VALUES (?, ?, ?)", batch)
+            self._db.execute(
+                "INSERT OR REPLACE INTO ingest_state (source, records, complete) VALUES (?, ?, ?)",
+                (source, records, int(complete)),
+            )
+            self._count = None
+
+
+def main(args):
+    """Entry point for `wiki-search --ingest DUMP`"""
+    index = OfflineIndex()
+    start = time.perf_counter()
+
+    def progress(records):
+        sys.stderr.write(f"\r{records:,} records ({time.perf_counter() - start:.0f}s)")
+        sys.stderr.flush()
+
+    try:
+        added = index.ingest(args.ingest, progress)
+    except KeyboardInterrupt:
+        sys.stderr.write("\nInterrupted; run again to resume.\n")
+        return 1
+    finally:
+        index.close()
+    sys.stderr.write(f"\nAdded {added:,} records in {time.perf_counter() - start:.1f}s\n")
+    return 0
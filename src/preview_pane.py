@@ -0,0 +1,51 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtWidgets import QFrame, QLabel, QTextBrowser, QVBoxLayout
+
+
+class PreviewPane(QFrame):
+    """Shows the lead extract and thumbnail of the selected article"""
+
+    THUMB_SIZE = 240
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumWidth(260)
+        layout = QVBoxLayout(self)
+
+        self.title_label = QLabel()
+        self.title_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        self.title_label.setWordWrap(True)
+        layout.addWidget(self.title_label)
+
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.image_label.setVisible(False)
+        layout.addWidget(self.image_label)
+
+        self.extract_view = QTextBrowser()
+        self.extract_view.setOpenLinks(False)
+        layout.addWidget(self.extract_view)
+
+        self.show_message("Select a result to preview it")
+
+    def show_message(self, message, title=""):
+        self.title_label.setText(title)
+        self.image_label.clear()
+        self.image_label.setVisible(False)
+        self.extract_view.setPlainText(message)
+
+    def show_summary(self, summary, image_data=None):
+        self.title_label.setText(summary.get('title', ''))
+        self.extract_view.setPlainText(summary.get('extract') or "No summary available")
+
+        pixmap = QPixmap()
+        if image_data and pixmap.loadFromData(image_data):
+            self.image_label.setPixmap(pixmap.scaled(
+                self.THUMB_SIZE, self.THUMB_SIZE,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation))
+            self.image_label.setVisible(True)
+        else:
+            self.image_label.clear()
+            self.image_label.setVisible(False)
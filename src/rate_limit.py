@@ -0,0 +1,72 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if now is None:
+        now = time.time()
+    return max(0.0, when.timestamp() - now)
+
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by all request workers.
+
+    Callers only wait when the configured rate would actually be exceeded;
+    a burst of up to `capacity` requests goes out immediately. Waiting always
+    happens on the calling worker thread, never on the Qt event loop.
+    The clock and sleep functions are injectable so it can be driven by a
+    fake clock.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return how many seconds to wait before using it"""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self):
+        """Block the calling (worker) thread until a request may be sent"""
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+
+    def release(self):
+        """Return an unused token"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def defer(self, seconds):
+        """Hold every request back for `seconds`, e.g. after HTTP 429 Retry-After"""
+        with self._lock:
+            now = self._clock()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
@@ -0,0 +1,150 @@
+from wiki_http import ARTICLE_URL, article_url
+
+NO_DESCRIPTION = 'No description'
+
+
+class ResultSet:
+    """Search results as parallel columns instead of one dict per article.
+
+    `titles` and `descriptions` are plain lists, usually the very lists
+    decoded from the API's JSON, so building a result set allocates nothing
+    per row. URLs are derived from titles on demand; `urls` is only kept
+    when a source supplies URLs that can't be derived (e.g. another wiki's
+    dump). Rows are read through title(i)/description(i)/url(i); dicts are
+    only built for output (to_dicts).
+
+    Sources work the same way: `origin` names the wiki a whole set came from
+    ('' for the configured one) and `sources` is only materialized once rows
+    from several wikis are mixed, as in a federated search.
+
+    A ResultSet is handed to the results model by reference and the model
+    edits it in place, so pass a copy() to anything that keeps it.
+    """
+
+    __slots__ = ('titles', 'descriptions', 'urls', 'base', 'origin', 'sources')
+
+    def __init__(self, titles=None, descriptions=None, urls=None, base=ARTICLE_URL,
+                 origin='', sources=None):
+        self.titles = titles if isinstance(titles, list) else list(titles or ())
+        if not isinstance(descriptions, list):
+            descriptions = list(descriptions or ())
+        if len(descriptions) < len(self.titles):
+            descriptions.extend([NO_DESCRIPTION] * (len(self.titles) - len(descriptions)))
+        self.descriptions = descriptions
+        if urls is not None and not isinstance(urls, list):
+            urls = list(urls)
+        self.urls = urls
+        self.base = base
+        if sources is not None and not isinstance(sources, list):
+            sources = list(sources)
+        self.origin = origin
+        self.sources = sources
+
+    @classmethod
+    def from_dicts(cls, articles):
+        """From a list of {'title', 'description', 'url'} dicts"""
+        articles = list(articles)
+        return cls([a.get('title', '') for a in articles],
+                   [a.get('description', NO_DESCRIPTION) for a in articles],
+                   [a.get('url') or article_url(a.get('title', '')) for a in articles])
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Inverse of to_columns()"""
+        return cls(columns['titles'], columns['descriptions'], columns.get('urls'),
+                   columns.get('base', ARTICLE_URL), columns.get('origin', ''),
+                   columns.get('sources'))
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __getitem__(self, index):
+        """A slice of the rows as a new ResultSet"""
+        if not isinstance(index, slice):
+            raise TypeError("ResultSet rows are read with title(i), description(i) and url(i)")
+        return ResultSet(self.titles[index], self.descriptions[index],
+                         None if self.urls is None else self.urls[index], self.base,
+                         self.origin, None if self.sources is None else self.sources[index])
+
+    def __repr__(self):
+        return f"<ResultSet of {len(self)} rows>"
+
+    def title(self, i):
+        return self.titles[i]
+
+    def description(self, i):
+        return self.descriptions[i]
+
+    def url(self, i):
+        if self.urls is not None:
+            return self.urls[i]
+        return article_url(self.titles[i], self.base)
+
+    def source(self, i):
+        """Name of the wiki row `i` came from"""
+        if self.sources is not None:
+            return self.sources[i]
+        return self.origin
+
+    def row(self, i):
+        """(title, description, url) of one row"""
+        return self.titles[i], self.descriptions[i], self.url(i)
+
+    def copy(self):
+        return self[:]
+
+    def to_dicts(self):
+        return [{'title': t, 'description': d, 'url': self.url(i)}
+                for i, (t, d) in enumerate(zip(self.titles, self.descriptions))]
+
+    def to_columns(self):
+        """JSON-serializable form, much smaller than a list of dicts"""
+        columns = {'titles': self.titles, 'descriptions': self.descriptions}
+        if self.urls is not None:
+            columns['urls'] = self.urls
+        if self.base != ARTICLE_URL:
+            columns['base'] = self.base
+        if self.origin:
+            columns['origin'] = self.origin
+        if self.sources is not None:
+            columns['sources'] = self.sources
+        return columns
+
+    # In-place edits, used by the results model and when merging
+
+    def splice(self, start, stop, other=None, other_start=0, other_stop=None):
+        """Replace rows [start:stop] with rows [other_start:other_stop] of `other`
+        (just remove them when `other` is None), like slice assignment on a list
+        """
+        if other is None:
+            del self.titles[start:stop]
+            del self.descriptions[start:stop]
+            if self.urls is not None:
+                del self.urls[start:stop]
+            if self.sources is not None:
+                del self.sources[start:stop]
+            return
+        if other_stop is None:
+            other_stop = len(other)
+        if self.urls is None and (other.urls is not None or other.base != self.base):
+            self._store_urls()
+        if self.sources is None and (other.sources is not None or other.origin != self.origin):
+            self.sources = [self.origin] * len(self)
+        self.titles[start:stop] = other.titles[other_start:other_stop]
+        self.descriptions[start:stop] = other.descriptions[other_start:other_stop]
+        if self.urls is not None:
+            self.urls[start:stop] = [other.url(i) for i in range(other_start, other_stop)]
+        if self.sources is not None:
+            self.sources[start:stop] = [other.source(i) for i in range(other_start, other_stop)]
+
+    def extend(self, other):
+        self.splice(len(self), len(self), other)
+
+    def append_row(self, other, i):
+        """Append row `i` of `other`"""
+        self.splice(len(self), len(self), other, i, i + 1)
+
+    def _store_urls(self):
+        # Rows from another source (or wiki) are about to be mixed in, so
+        # derived URLs have to be pinned down first
+        self.urls = [self.url(i) for i in range(len(self))]
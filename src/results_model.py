@@ -0,0 +1,163 @@
+from difflib import SequenceMatcher
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRectF, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+
+from results import ResultSet
+
+URL_ROLE = Qt.ItemDataRole.UserRole
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """Search results as a table model; the view only asks for visible rows.
+
+    Rows live in a ResultSet taken by reference, so no per-row objects are
+    created for the view either.
+    """
+
+    COLUMNS = ('Title', 'Description', 'Link', 'Source')
+    TITLE, DESCRIPTION, LINK, SOURCE = range(4)  # Source is hidden unless searching several wikis
+    MAX_DIFF_ROWS = 4000  # beyond this a reset is cheaper than diffing
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._articles = ResultSet()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._articles)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.TITLE:
+                return self._articles.titles[row]
+            if column == self.DESCRIPTION:
+                return self._articles.descriptions[row]
+            if column == self.SOURCE:
+                return self._articles.source(row)
+            return None
+        if role == Qt.ItemDataRole.ToolTipRole and column == self.DESCRIPTION:
+            return self._articles.descriptions[row]
+        if role == URL_ROLE:
+            return self._articles.url(row)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def articles(self):
+        return self._articles
+
+    def title(self, row):
+        return self._articles.titles[row]
+
+    def source(self, row):
+        return self._articles.source(row)
+
+    def set_articles(self, articles):
+        """Replace all rows; the model keeps and edits `articles` itself"""
+        self.beginResetModel()
+        self._articles = articles
+        self.endResetModel()
+
+    def update_articles(self, articles):
+        """Turn the current rows into `articles` with a minimal set of row
+        inserts, removals and in-place changes, so unchanged rows, the
+        selection and the scroll position survive.
+        """
+        new = articles
+        old = self._articles
+        if not old or not new or len(old) + len(new) > self.MAX_DIFF_ROWS:
+            self.set_articles(new)
+            return
+
+        matcher = SequenceMatcher(None, old.titles, new.titles, autojunk=False)
+        # Apply from the bottom up so earlier row numbers stay valid
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag == 'equal' or (tag == 'replace' and i2 - i1 == j2 - j1):
+                changed = [k for k in range(i2 - i1) if old.row(i1 + k) != new.row(j1 + k)]
+                for k in changed:
+                    old.splice(i1 + k, i1 + k + 1, new, j1 + k, j1 + k + 1)
+                if changed:
+                    self.dataChanged.emit(self.index(i1 + changed[0], 0),
+                                          self.index(i1 + changed[-1], len(self.COLUMNS) - 1))
+                continue
+            if i2 > i1:
+                self.beginRemoveRows(QModelIndex(), i1, i2 - 1)
+                old.splice(i1, i2)
+                self.endRemoveRows()
+            if j2 > j1:
+                self.beginInsertRows(QModelIndex(), i1, i1 + (j2 - j1) - 1)
+                old.splice(i1, i1, new, j1, j2)
+                self.endInsertRows()
+
+    def append_articles(self, articles):
+        """Append rows without resetting the view"""
+        if not articles:
+            return
+        first = len(self._articles)
+        self.beginInsertRows(QModelIndex(), first, first + len(articles) - 1)
+        self._articles.extend(articles)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_articles(ResultSet())
+
+
+class LinkButtonDelegate(QStyledItemDelegate):
+    """Paints the "Open" button in the Link column and turns clicks into `clicked(url)`.
+
+    Replaces one styled QPushButton per row: nothing is created per row and
+    the look is fixed here instead of parsed from a stylesheet every time.
+    """
+
+    clicked = pyqtSignal(str)
+
+    TEXT = "🔗 Open"
+    COLOR = QColor("#3498DB")
+    HOVER_COLOR = QColor("#2980B9")
+    DISABLED_COLOR = QColor("#BDC3C7")
+
+    def paint(self, painter, option, index):
+        url = index.data(URL_ROLE)
+        if not url:
+            color = self.DISABLED_COLOR
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            color = self.HOVER_COLOR
+        else:
+            color = self.COLOR
+
+        rect = QRectF(option.rect).adjusted(4, 4, -4, -4)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, self.TEXT)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and option.rect.contains(event.position().toPoint())):
+            url = index.data(URL_ROLE)
+            if url:
+                self.clicked.emit(url)
+            return True
+        return super().editorEvent(event, model, option, index)
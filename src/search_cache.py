@@ -0,0 +1,184 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import app_paths
+from results import ResultSet
+
+DEFAULT_TTL = 24 * 60 * 60  # one day
+
+
+def normalize_query(query):
+    """Case- and whitespace-insensitive form of a query used for cache keys"""
+    return " ".join(query.split()).casefold()
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used key (not thread-safe)"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+
+class _Entry:
+    __slots__ = ('limit', 'articles', 'fetched_at')
+
+    def __init__(self, limit, articles, fetched_at):
+        self.limit = limit
+        self.articles = articles
+        self.fetched_at = fetched_at
+
+    def covers(self, limit):
+        # A result with fewer rows than its limit is the complete answer,
+        # so it can serve any limit; otherwise only limits up to its own.
+        return limit <= self.limit or len(self.articles) < self.limit
+
+
+class SearchCache:
+    """Two-tier opensearch result cache: a bounded in-memory LRU in front of
+    a persistent SQLite store, both with a TTL.
+
+    Entries are keyed on (normalized query, namespace) and remember the limit
+    they were fetched with, so a request for 5 results is answered from a
+    cached request for 20.
+    """
+
+    def __init__(self, db_path=None, max_memory_entries=256, ttl=DEFAULT_TTL, clock=time.time):
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+        self._memory = LRUCache(max_memory_entries)
+        self._lock = threading.Lock()
+
+        if db_path is None:
+            db_path = app_paths.cache_dir() / "search_cache.sqlite3"
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                query TEXT NOT NULL,
+                namespace INTEGER NOT NULL,
+                result_limit INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                articles TEXT NOT NULL,
+                PRIMARY KEY (query, namespace)
+            )
+        """)
+        self._db.commit()
+
+    def get(self, query, limit, namespace=0):
+        """Return a ResultSet (a copy) for the query or None on a miss"""
+        key = (normalize_query(query), int(namespace))
+        now = self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._fresh(entry, now) and entry.covers(limit):
+                self.hits += 1
+                self.memory_hits += 1
+                return entry.articles[:limit]
+
+            entry = self._load(key, now)
+            if entry is not None and entry.covers(limit):
+                self._memory.put(key, entry)
+                self.hits += 1
+                return entry.articles[:limit]
+
+            self.misses += 1
+            return None
+
+    def put(self, query, limit, articles, namespace=0):
+        """Store a fresh network result, unless a wider one is still fresh"""
+        key = (normalize_query(query), int(namespace))
+        now = self.clock()
+        entry = _Entry(int(limit), articles.copy(), now)
+        with self._lock:
+            current = self._memory.get(key)
+            if current is None or not self._fresh(current, now):
+                current = self._load(key, now)
+            if current is not None and current.limit > entry.limit and not entry.covers(current.limit):
+                # Keep the larger cached result; it expires when it was due to
+                self._memory.put(key, current)
+                return
+            self._memory.put(key, entry)
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key[0], key[1], entry.limit, entry.fetched_at,
+                 json.dumps(entry.articles.to_columns())),
+            )
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+
+    def purge_expired(self):
+        """Drop expired rows from the persistent store"""
+        with self._lock:
+            self._purge_expired()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.hits - self.memory_hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+            }
+
+    def close(self):
+        """Drop expired rows, so typeahead prefixes don't pile up, and close"""
+        with self._lock:
+            self._purge_expired()
+            self._db.close()
+
+    def _purge_expired(self):
+        self._db.execute("DELETE FROM results WHERE fetched_at < ?", (self.clock() - self.ttl,))
+        self._db.commit()
+
+    def _fresh(self, entry, now):
+        return now - entry.fetched_at < self.ttl
+
+    def _load(self, key, now):
+        row = self._db.execute(
+            "SELECT result_limit, fetched_at, articles FROM results WHERE query = ? AND namespace = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        stored = json.loads(row[2])
+        if isinstance(stored, list):
+            articles = ResultSet.from_dicts(stored)  # written before results were columnar
+        else:
+            articles = ResultSet.from_columns(stored)
+        entry = _Entry(row[0], articles, row[1])
+        return entry if self._fresh(entry, now) else None
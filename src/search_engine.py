@@ -0,0 +1,295 @@
+"""asyncio search engine shared by the GUI and batch mode.
+
+All searches, result pages and later summary fetches are coroutines that
+multiplex over one connection pool (the shared session in wiki_http). The
+coroutine API works on any running loop; the GUI additionally starts the
+engine's own loop on a dedicated thread and submits work to it.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import wiki_api
+import wiki_http
+from search_metrics import SearchTiming
+
+
+class _Flight:
+    __slots__ = ('task', 'waiters', 'context')
+
+    def __init__(self, task, context=None):
+        self.task = task
+        self.waiters = 0
+        self.context = context
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls: callers with the same key share
+    one in-flight task and all get its result (or its exception).
+
+    The shared task is only cancelled once every caller waiting on it has
+    been cancelled and none joined within `linger` seconds, so a search that
+    is cancelled and re-issued right away (Enter after typing the query)
+    joins the request already on the wire instead of sending another.
+    """
+
+    def __init__(self, linger=0.05):
+        self.linger = linger
+        self.requests = 0   # calls that started a task
+        self.coalesced = 0  # calls that joined one already in flight
+        self._flights = {}
+
+    async def run(self, key, factory, context=None):
+        """Await `factory()`, or the task of an identical call still running.
+
+        `context` is kept with a task this call starts; see leader_context().
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()), context)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._done(key, flight, task))
+            self.requests += 1
+        else:
+            self.coalesced += 1
+        flight.waiters += 1
+        try:
+            # shield: one caller being cancelled must not cancel the others
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                asyncio.get_running_loop().call_later(self.linger, self._release, key, flight)
+
+    def leader_context(self, key):
+        """The `context` of the call whose task a call with this key would
+        join, or None if it would start its own
+        """
+        flight = self._flights.get(key)
+        return flight.context if flight is not None else None
+
+    def stats(self):
+        return {'requests': self.requests, 'coalesced': self.coalesced}
+
+    def _release(self, key, flight):
+        if flight.waiters == 0 and not flight.task.done():
+            self._forget(key, flight)
+            flight.task.cancel()
+
+    def _done(self, key, flight, task):
+        self._forget(key, flight)
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every caller had given up on it
+
+    def _forget(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+class SearchEngine:
+    def __init__(self, max_concurrency=16):
+        self.max_concurrency = max_concurrency
+        self.loop = None
+        self._thread = None
+        self._semaphore = None
+        # Identical searches in flight at the same time share one request
+        self.single_flight = SingleFlight()
+        # Long-lived I/O threads for the blocking sends; created once, not per search
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="wiki-io")
+
+    # Coroutine API
+
+    async def fetch(self, params, parse, timing=None, url=None):
+        """Send one API request (to `url`, the configured API by default) and
+        parse the response off the event loop.
+
+        Phase timings are added to `timing` (a search_metrics.SearchTiming) if given.
+        """
+        async with self._slots():
+            response = await wiki_http.api_get_async(params, url, executor=self._executor,
+                                                     timing=timing)
+            loop = asyncio.get_running_loop()
+            start = time.perf_counter()
+            result = await loop.run_in_executor(self._executor, parse, response)
+            if timing is not None:
+                timing.add('parse', (time.perf_counter() - start) * 1000)
+            return result
+
+    async def opensearch(self, query, limit=10, namespace=0, timing=None, wiki=None):
+        """ResultSet for the query on `wiki` (a wikis.Wiki; the configured API
+        when None). Identical concurrent calls send one request; its phases
+        are timed into the `timing` of the call that sent it and copied into
+        the others' once it has answered.
+        """
+        url = wiki.api_url if wiki is not None else None
+        key = ('opensearch', url, query, limit, namespace)
+        leader = self.single_flight.leader_context(key)
+        articles = await self.single_flight.run(
+            key,
+            partial(self.fetch, wiki_api.opensearch_params(query, limit, namespace),
+                    partial(wiki_api.parse_opensearch, wiki=wiki), timing, url),
+            timing)
+        if timing is not None and leader is not None:
+            timing.copy_request_phases(leader)
+        # Every caller gets its own copy: the results model edits its rows in place
+        return articles.copy()
+
+    async def search_page(self, query, offset=0, limit=50, namespace=0):
+        articles, next_offset, total_hits = await self.single_flight.run(
+            ('search_page', None, query, offset, limit, namespace),
+            partial(self.fetch, wiki_api.search_page_params(query, offset, limit, namespace),
+                    wiki_api.parse_search_page))
+        return articles.copy(), next_offset, total_hits
+
+    async def summaries(self, titles, thumb_size=240, wiki=None):
+        """Lead extracts and thumbnail URLs for up to 20 titles in one request"""
+        titles = list(titles)[:wiki_api.MAX_SUMMARY_TITLES]
+        return await self.fetch(wiki_api.summaries_params(titles, thumb_size),
+                                partial(wiki_api.parse_summaries, titles), None,
+                                wiki.api_url if wiki is not None else None)
+
+    async def fetch_image(self, url):
+        """Raw bytes of an image such as a page thumbnail"""
+        async with self._slots():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, wiki_http.fetch_bytes, url)
+
+    async def run_blocking(self, fn, *args):
+        """Run a blocking call (e.g. an offline index query) on the I/O executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args))
+
+    async def opensearch_many(self, queries, limit=10, namespace=0):
+        """Fan out several searches at once; returns results in query order"""
+        return await asyncio.gather(*(self.opensearch(q, limit, namespace) for q in queries))
+
+    async def federated(self, query, wikis, limit=10, namespace=0, on_result=None):
+        """Search every wiki in `wikis` at once over the shared pool; each host
+        is paced by its own rate limiter.
+
+        `on_result(wiki, articles, error, timing)` is called on the loop as
+        each wiki answers (articles is None and error a message if it failed);
+        returns those tuples in completion order.
+        """
+        async def search(wiki):
+            timing = SearchTiming(query, wiki.name)
+            try:
+                articles, error = await self.opensearch(query, limit, namespace, timing, wiki), None
+            except wiki_http.network_errors() as e:
+                articles, error = None, f"Network error: {str(e)}"
+            except Exception as e:
+                articles, error = None, str(e)
+            return wiki, articles, error, timing.finish()
+
+        tasks = [asyncio.ensure_future(search(wiki)) for wiki in wikis]
+        results = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                results.append(result)
+                if on_result is not None:
+                    on_result(*result)
+        finally:
+            # Cancelled (e.g. superseded by a new search): drop the wikis still pending
+            for task in tasks:
+                task.cancel()
+        return results
+
+    def _slots(self):
+        # Created lazily so it belongs to whichever loop runs the coroutines
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    # Dedicated loop thread (used by the GUI)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="wiki-search-engine",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the engine loop from any thread.
+
+        Returns a concurrent.futures.Future; cancelling it cancels the task.
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_soon(self, callback, *args):
+        """Run a plain callback on the engine loop from any thread"""
+        self.start()
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self):
+        if self._thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+            # Let whatever was still in flight see its cancellation before closing
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.close()
+            self._thread = None
+            self.loop = None
+        self._executor.shutdown(wait=False)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+
+class PagedSearch:
+    """Demand-driven list=search pagination running on the engine loop.
+
+    Keeps `prefetch_pages` pages ahead of what has been asked for and waits
+    for request_more() before going further. `on_page(articles, total_hits)`
+    is called on the engine loop for every page.
+    """
+
+    def __init__(self, engine, query, page_size=50, prefetch_pages=2, namespace=0, on_page=None):
+        self.engine = engine
+        self.query = query
+        self.page_size = page_size
+        self.prefetch_pages = prefetch_pages
+        self.namespace = namespace
+        self.on_page = on_page
+        self._pages_wanted = prefetch_pages
+        self._pages_fetched = 0
+        self._more = None
+
+    async def run(self):
+        """Fetch pages until the results run out; returns the number of rows loaded"""
+        self._more = asyncio.Event()
+        offset = 0
+        loaded = 0
+        while True:
+            while self._pages_fetched >= self._pages_wanted:
+                self._more.clear()
+                await self._more.wait()
+
+            articles, offset, total_hits = await self.engine.search_page(
+                self.query, offset, self.page_size, self.namespace)
+            self._pages_fetched += 1
+            loaded += len(articles)
+            if self.on_page is not None:
+                self.on_page(articles, total_hits)
+            if offset is None:
+                return loaded
+
+    def request_more(self):
+        """Thread-safe: keep `prefetch_pages` pages ahead of those fetched so far"""
+        self.engine.call_soon(self._request_more)
+
+    def _request_more(self):
+        self._pages_wanted = max(self._pages_wanted, self._pages_fetched + self.prefetch_pages)
+        if self._more is not None:
+            self._more.set()
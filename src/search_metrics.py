@@ -0,0 +1,160 @@
+"""Per-search latency breakdown, kept in a ring buffer with percentile aggregates.
+
+Phases (milliseconds):
+
+* queue:    submit until the request is handed to a socket (engine scheduling,
+            concurrency slots, executor queue), excluding rate limiting
+* rate_limit: waiting on the token bucket
+* connect:  DNS lookup + TCP connect (0 on a reused keep-alive connection);
+            urllib3 does both in one call, so they are not reported apart
+* tls:      TLS handshake (0 on reused connections and plain http)
+* ttfb:     request sent until response headers, excluding connect/tls
+* transfer: response headers until the body is read
+* parse:    JSON decoding and building the article list
+* render:   filling the results table in display_results
+"""
+import json
+import math
+import threading
+import time
+from collections import deque
+
+PHASES = ('queue', 'rate_limit', 'connect', 'tls', 'ttfb', 'transfer', 'parse', 'render', 'total')
+# Measured on the request itself, so shared by every search it answered
+REQUEST_PHASES = ('rate_limit', 'connect', 'tls', 'ttfb', 'transfer', 'parse')
+QUANTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(p / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+class SearchTiming:
+    """Timings of one search, filled in by the layers it passes through.
+
+    `source` names the wiki searched in a federated search ('' otherwise).
+    """
+
+    __slots__ = ('query', 'source', 'started', 'phases')
+
+    def __init__(self, query='', source=''):
+        self.query = query
+        self.source = source
+        self.started = time.perf_counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+    def add(self, phase, ms):
+        self.phases[phase] += ms
+
+    def copy_request_phases(self, other):
+        """Take the request phases of `other`, the search whose request this
+        one joined instead of sending its own
+        """
+        for phase in REQUEST_PHASES:
+            self.phases[phase] = other.phases[phase]
+
+    def finish(self):
+        self.phases['total'] = (time.perf_counter() - self.started) * 1000
+        return self
+
+    def to_dict(self):
+        return {'query': self.query, 'source': self.source,
+                **{k: round(v, 3) for k, v in self.phases.items()}}
+
+
+# The connection classes in wiki_http report connect/TLS time into the
+# timing of the request running on the current thread.
+_current = threading.local()
+
+
+def set_current(timing):
+    _current.timing = timing
+
+
+def current():
+    return getattr(_current, 'timing', None)
+
+
+def _summary(sorted_values):
+    stats = {f"p{q}": percentile(sorted_values, q) for q in QUANTILES}
+    stats['mean'] = sum(sorted_values) / len(sorted_values) if sorted_values else 0.0
+    stats['count'] = len(sorted_values)
+    return stats
+
+
+class MetricsRecorder:
+    """Ring buffer of the last `size` search timings.
+
+    `counters`, if given, is a callable returning {name: count} of running
+    totals (e.g. SingleFlight.stats) that are exported along with the timings.
+    """
+
+    def __init__(self, size=500, counters=None):
+        self._timings = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._counters = counters
+
+    def __len__(self):
+        return len(self._timings)
+
+    def record(self, timing):
+        with self._lock:
+            self._timings.append(timing.to_dict())
+
+    def recent(self):
+        with self._lock:
+            return list(self._timings)
+
+    def aggregates(self):
+        """{phase: {'p50', 'p95', 'p99', 'mean', 'count'}} over the buffer"""
+        timings = self.recent()
+        return {phase: _summary(sorted(t[phase] for t in timings)) for phase in PHASES}
+
+    def endpoints(self):
+        """{source: the same summary of total latency} for federated searches"""
+        totals = {}
+        for t in self.recent():
+            if t.get('source'):
+                totals.setdefault(t['source'], []).append(t['total'])
+        return {source: _summary(sorted(values)) for source, values in sorted(totals.items())}
+
+    def counters(self):
+        return dict(self._counters()) if self._counters is not None else {}
+
+    def to_json(self):
+        return json.dumps({'aggregates': self.aggregates(), 'endpoints': self.endpoints(),
+                           'counters': self.counters(), 'searches': self.recent()}, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition: one summary per phase, in seconds"""
+        lines = [
+            "# HELP wikisearch_search_phase_seconds Search latency by phase.",
+            "# TYPE wikisearch_search_phase_seconds summary",
+        ]
+        timings = self.recent()
+        for phase in PHASES:
+            values = sorted(t[phase] for t in timings)
+            for q in QUANTILES:
+                lines.append(f'wikisearch_search_phase_seconds{{phase="{phase}",quantile="{q / 100}"}} '
+                             f'{percentile(values, q) / 1000:.6f}')
+            lines.append(f'wikisearch_search_phase_seconds_sum{{phase="{phase}"}} {sum(values) / 1000:.6f}')
+            lines.append(f'wikisearch_search_phase_seconds_count{{phase="{phase}"}} {len(values)}')
+        endpoints = self.endpoints()
+        if endpoints:
+            lines.append("# HELP wikisearch_endpoint_seconds Federated search latency by wiki.")
+            lines.append("# TYPE wikisearch_endpoint_seconds summary")
+        for source, stats in endpoints.items():
+            for q in QUANTILES:
+                lines.append(f'wikisearch_endpoint_seconds{{endpoint="{source}",quantile="{q / 100}"}} '
+                             f'{stats[f"p{q}"] / 1000:.6f}')
+            lines.append(f'wikisearch_endpoint_seconds_sum{{endpoint="{source}"}} '
+                         f'{stats["mean"] * stats["count"] / 1000:.6f}')
+            lines.append(f'wikisearch_endpoint_seconds_count{{endpoint="{source}"}} {stats["count"]}')
+        for name, value in self.counters().items():
+            lines.append(f"# TYPE wikisearch_{name}_total counter")
+            lines.append(f"wikisearch_{name}_total {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,131 @@
+import os
+from bisect import bisect_left
+
+import app_paths
+from results import ResultSet, NO_DESCRIPTION
+
+_SEP = "\x00"
+
+
+def _clean(text):
+    return " ".join(text.split())
+
+
+def _key(title):
+    return _clean(title).casefold()
+
+
+class TitleIndex:
+    """Local prefix index over every article title seen in search results.
+
+    Each entry is kept as a single string "key\\0title\\0description" in one
+    sorted list. Since "\\0" sorts before any other character, the list is
+    ordered by key and a prefix lookup is a bisect plus a short forward scan.
+    One str per entry keeps the index compact at hundreds of thousands of
+    titles; URLs are derived from titles rather than stored.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = app_paths.cache_dir() / "title_index.txt"
+        self.path = path
+        self._records = []
+        self._pending = {}
+        self._dirty = False
+        self._loaded = False
+
+    def __len__(self):
+        self._flush()
+        return len(self._records)
+
+    def add(self, articles):
+        """Remember titles and descriptions from a ResultSet"""
+        for title, description in zip(articles.titles, articles.descriptions):
+            title = _clean(title)
+            if not title:
+                continue
+            key = title.casefold()
+            description = _clean(description)
+            self._pending[key] = _SEP.join((key, title, description))
+        self._dirty = self._dirty or bool(self._pending)
+
+    def prefix(self, query, limit=10):
+        """Return a ResultSet of up to `limit` titles starting with `query`"""
+        self._flush()
+        prefix = _key(query)
+        articles = ResultSet()
+        if not prefix:
+            return articles
+
+        records = self._records
+        i = bisect_left(records, prefix)
+        while i < len(records) and len(articles) < limit:
+            record = records[i]
+            if not record.startswith(prefix):
+                break
+            _, title, description = record.split(_SEP)
+            articles.titles.append(title)
+            articles.descriptions.append(description or NO_DESCRIPTION)
+            i += 1
+        return articles
+
+    def read(self):
+        """Sorted records of the persisted index; touches no state, so it can
+        run on a worker thread and be handed to load() afterwards
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                records = f.read().split("\n")
+        except FileNotFoundError:
+            return []
+        records = [r for r in records if r.count(_SEP) == 2]
+        records.sort()  # already sorted on disk, so this is a linear pass
+        return records
+
+    def load(self, records=None):
+        """Load the persisted index, or `records` already read(). Titles
+        added before it was loaded are kept, and win over the stored ones.
+        """
+        if records is None:
+            records = self.read()
+        for record in self._records:
+            self._pending.setdefault(record.split(_SEP, 1)[0], record)
+        self._records = records
+        self._loaded = True
+        self._dirty = bool(self._pending)
+
+    def save(self):
+        """Persist the index atomically if it changed since the last load/save"""
+        if not self._loaded:
+            self.load()  # quitting before the background read: keep what is on disk
+        self._flush()
+        if not self._dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self._records))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _flush(self):
+        """Merge pending additions into the sorted record list"""
+        if not self._pending:
+            return
+        records = self._records
+        pending = self._pending
+        self._pending = {}
+
+        if len(pending) > 1000:
+            # Bulk load: rebuild once instead of inserting one by one
+            kept = [r for r in records if r.split(_SEP, 1)[0] not in pending]
+            kept.extend(pending.values())
+            kept.sort()
+            self._records = kept
+            return
+
+        for key, record in pending.items():
+            i = bisect_left(records, key + _SEP)
+            if i < len(records) and records[i].split(_SEP, 1)[0] == key:
+                records[i] = record
+            else:
+                records.insert(i, record)
@@ -0,0 +1,167 @@
+import html
+import re
+
+import json_decode
+from rate_limit import parse_retry_after
+from results import ResultSet, NO_DESCRIPTION
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_MATCH_OPEN = '<span class="searchmatch">'
+_MATCH_CLOSE = '</span>'
+# The entities MediaWiki escapes snippets with, replaced without html.unescape()
+# when they are the only ones; &amp; goes last so "&amp;lt;" stays "&lt;"
+_COMMON_ENTITIES = (('&quot;', '"'), ('&#039;', "'"), ('&lt;', '<'), ('&gt;', '>'), ('&amp;', '&'))
+_OTHER_ENTITY_RE = re.compile(r"&(?!(?:quot|#039|lt|gt|amp);)")
+
+
+class ApiError(Exception):
+    """The API answered, but not with something we can use"""
+
+
+def check_response(response):
+    """Raise ApiError for rate limiting, requests' HTTPError for other failures"""
+    if response.status_code == 429:
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        wait = f"{retry_after:.0f} seconds" if retry_after else "a few seconds"
+        raise ApiError(f"Rate limit reached. Please wait {wait} and try again.")
+    response.raise_for_status()
+
+
+def strip_snippet(snippet):
+    """Plain text from a list=search snippet (HTML with searchmatch spans)"""
+    if not snippet:
+        return ""
+    if '<' in snippet:
+        # Almost all markup is the searchmatch highlighting; plain replaces are
+        # much cheaper than the regex, which only runs for anything else
+        snippet = snippet.replace(_MATCH_OPEN, "").replace(_MATCH_CLOSE, "")
+        if '<' in snippet:
+            snippet = _TAG_RE.sub("", snippet)
+    if '&' in snippet:
+        if _OTHER_ENTITY_RE.search(snippet) is None:
+            for entity, char in _COMMON_ENTITIES:
+                snippet = snippet.replace(entity, char)
+        else:
+            snippet = html.unescape(snippet)
+    return snippet.strip()
+
+
+def opensearch_params(query, limit=10, namespace=0):
+    return {
+        'action': 'opensearch',
+        'search': query,
+        'limit': limit,
+        'format': 'json',
+        'namespace': str(namespace),
+    }
+
+
+def parse_opensearch(response, wiki=None):
+    """ResultSet from an opensearch response of `wiki` (a wikis.Wiki; the
+    configured API when None).
+
+    The title and description arrays are used as decoded; the URL array is
+    dropped since article_url() derives the same URLs from the titles.
+    """
+    check_response(response)
+    try:
+        titles, descriptions = json_decode.decode_opensearch(response.content)
+    except ValueError:
+        raise ApiError("Invalid response format from Wikipedia API") from None
+    if wiki is not None:
+        return ResultSet(titles, descriptions, base=wiki.article_base, origin=wiki.name)
+    return ResultSet(titles, descriptions)
+
+
+def search_page_params(query, offset=0, limit=50, namespace=0):
+    return {
+        'action': 'query',
+        'list': 'search',
+        'srsearch': query,
+        'srnamespace': str(namespace),
+        'srlimit': limit,
+        'sroffset': offset,
+        'srinfo': 'totalhits',
+        'srprop': 'snippet',
+        'format': 'json',
+    }
+
+
+def parse_search_page(response):
+    """(ResultSet, next_offset, total_hits) from a list=search response;
+    next_offset is None once the API has no continuation left.
+    """
+    check_response(response)
+    try:
+        page = json_decode.decode_search_page(response.content)
+    except ValueError:
+        raise ApiError("Invalid response format from Wikipedia API") from None
+    if page.error is not None:
+        raise ApiError(page.error)
+
+    articles = ResultSet(page.titles,
+                         [strip_snippet(snippet) or NO_DESCRIPTION for snippet in page.snippets])
+    return articles, page.next_offset, page.total_hits
+
+
+# prop=extracts only returns intro extracts for up to 20 titles per request
+MAX_SUMMARY_TITLES = 20
+
+
+def summaries_params(titles, thumb_size=240):
+    """One batched request for the lead extract and thumbnail of several titles"""
+    return {
+        'action': 'query',
+        'prop': 'extracts|pageimages',
+        'titles': '|'.join(titles[:MAX_SUMMARY_TITLES]),
+        'exintro': 1,
+        'explaintext': 1,
+        'exlimit': 'max',
+        'piprop': 'thumbnail',
+        'pithumbsize': thumb_size,
+        'pilimit': 'max',
+        'redirects': 1,
+        'format': 'json',
+        'formatversion': 2,
+    }
+
+
+def parse_summaries(titles, response):
+    """{requested title: {'title', 'extract', 'thumbnail'}}, following the
+    API's title normalization and redirects back to the titles we asked for
+    """
+    check_response(response)
+    try:
+        data = json_decode.loads(response.content)
+    except ValueError:
+        raise ApiError("Invalid response format from Wikipedia API") from None
+    if 'error' in data:
+        raise ApiError(data['error'].get('info', 'Wikipedia API error'))
+    query = data.get('query', {})
+
+    pages = {}
+    for page in query.get('pages', []):
+        if page.get('missing') or page.get('invalid'):
+            continue
+        pages[page['title']] = {
+            'title': page['title'],
+            'extract': page.get('extract', ''),
+            'thumbnail': page.get('thumbnail', {}).get('source', ''),
+        }
+
+    aliases = {}
+    for key in ('normalized', 'redirects'):
+        for mapping in query.get(key, []):
+            aliases[mapping['from']] = mapping['to']
+
+    summaries = {}
+    for title in titles:
+        resolved = title
+        for _ in range(3):  # normalized -> redirect target
+            if resolved in pages or resolved not in aliases:
+                break
+            resolved = aliases[resolved]
+        if resolved in pages:
+            summaries[title] = pages[resolved]
+    return summaries
+
@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+import search_metrics
+from rate_limit import TokenBucket, parse_retry_after
+
+API_URL = "https://en.wikipedia.org/w/api.php"
+ARTICLE_URL = "https://en.wikipedia.org/wiki/"
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'WikiSearchApp/1.0 (your@email.com)',  # Replace with your email
+    'Accept': 'application/json',
+}
+
+
+def article_url(title, base=ARTICLE_URL):
+    """Article URL for a title, as opensearch would return it"""
+    return base + quote(title.replace(' ', '_'), safe="/:(),'!*")
+
+
+class HttpClientConfig:
+    """Settings for the shared HTTP session"""
+
+    def __init__(self, pool_connections=8, pool_maxsize=10, max_retries=3,
+                 backoff_factor=0.5, timeout=15, headers=None,
+                 requests_per_second=2.0, burst=5, max_retry_after=10.0, api_url=API_URL):
+        self.pool_connections = pool_connections  # hosts kept in the pool (federated wikis + thumbnails)
+        self.pool_maxsize = pool_maxsize          # keep-alive connections per host
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.requests_per_second = requests_per_second  # per host
+        self.burst = burst
+        self.max_retry_after = max_retry_after  # longest 429 back-off we wait out
+        self.api_url = api_url                  # e.g. a local mock API for benchmarks
+        self.headers = dict(DEFAULT_HEADERS)
+        if headers:
+            self.headers.update(headers)
+
+
+_lock = threading.Lock()
+_config = HttpClientConfig()
+_session = None
+_limiters = {}
+
+
+def configure(config):
+    """Replace the shared configuration; the next get_session() picks it up"""
+    global _config
+    with _lock:
+        _config = config
+        _limiters.clear()
+    close_session()
+
+
+def get_config():
+    return _config
+
+
+def get_session():
+    """Return the application-wide session, creating it on first use"""
+    global _session
+    with _lock:
+        if _session is None:
+            # requests and urllib3 take ~100 ms to import, so they are only
+            # loaded with the first request rather than at startup
+            from http_session import create_session
+            _session = create_session(_config)
+        return _session
+
+
+def get_rate_limiter(url=None):
+    """Return the token bucket that paces requests to the host of `url`
+    (the configured API by default). Every host is limited on its own, so a
+    slow or throttling wiki doesn't hold back the others.
+    """
+    host = urlsplit(url or _config.api_url).netloc
+    with _lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = TokenBucket(_config.requests_per_second, _config.burst)
+        return limiter
+
+
+def close_session():
+    """Close pooled connections (called when the application quits)"""
+    global _session
+    with _lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
+
+
+def api_get(params, url=None, timeout=None, timing=None):
+    """GET the MediaWiki API (the configured one unless `url` is given)
+    through the shared session.
+
+    The app itself goes through api_get_async; this blocking version is kept
+    for the benchmarks (bench_http_pool and the suite's parse fixtures).
+    It waits on the host's rate limiter and, on HTTP 429, defers all requests
+    to that host by the server's Retry-After and retries once if that wait is
+    short enough. Otherwise the 429 response is returned.
+    Phase timings are added to `timing` (a search_metrics.SearchTiming) if given.
+    """
+    if url is None:
+        url = _config.api_url
+    if timeout is None:
+        timeout = _config.timeout
+    limiter = get_rate_limiter(url)
+
+    for attempt in range(2):
+        start = time.perf_counter()
+        limiter.acquire()
+        if timing is not None:
+            timing.add('rate_limit', (time.perf_counter() - start) * 1000)
+        response = _send(get_session(), url, params, timeout, timing)
+        if not _should_retry(response, limiter):
+            break
+    return response
+
+
+async def api_get_async(params, url=None, timeout=None, executor=None, timing=None):
+    """Coroutine version of api_get for the asyncio search engine.
+
+    Rate-limit waits are asyncio sleeps, so they hold no thread; only the
+    blocking send runs on `executor`, still through the shared session and
+    its connection pool. Cancelling the awaiting task before the send hands
+    the rate-limit token back.
+    """
+    loop = asyncio.get_running_loop()
+    if url is None:
+        url = _config.api_url
+    if timeout is None:
+        timeout = _config.timeout
+    limiter = get_rate_limiter(url)
+
+    for attempt in range(2):
+        wait = limiter.reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                limiter.release()
+                raise
+            if timing is not None:
+                timing.add('rate_limit', wait * 1000)
+        response = await loop.run_in_executor(
+            executor, _send, get_session(), url, params, timeout, timing)
+        if not _should_retry(response, limiter):
+            break
+    return response
+
+
+def _send(session, url, params, timeout, timing):
+    """Blocking GET; fills in queue, connect, tls, ttfb and transfer on `timing`"""
+    if timing is None:
+        return session.get(url, params=params, timeout=timeout)
+
+    start = time.perf_counter()
+    if not timing.phases['queue']:
+        waited = (start - timing.started) * 1000 - timing.phases['rate_limit']
+        timing.add('queue', max(0.0, waited))
+    handshake_before = timing.phases['connect'] + timing.phases['tls']
+    search_metrics.set_current(timing)
+    try:
+        response = session.get(url, params=params, timeout=timeout)
+    finally:
+        search_metrics.set_current(None)
+
+    total_ms = (time.perf_counter() - start) * 1000
+    headers_ms = response.elapsed.total_seconds() * 1000  # send until headers parsed
+    handshake_ms = timing.phases['connect'] + timing.phases['tls'] - handshake_before
+    timing.add('ttfb', max(0.0, headers_ms - handshake_ms))
+    timing.add('transfer', max(0.0, total_ms - headers_ms))
+    return response
+
+
+def network_errors():
+    """Exception class for failed requests, for `except` clauses and isinstance.
+
+    Imports requests on first use, like get_session().
+    """
+    import requests
+    return requests.exceptions.RequestException
+
+
+def fetch_bytes(url, timeout=None):
+    """Download a file (e.g. a thumbnail) through the shared session"""
+    response = get_session().get(url, timeout=timeout if timeout is not None else _config.timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def _should_retry(response, limiter):
+    """On HTTP 429, defer every request to the host by Retry-After; retry if that is short"""
+    if response.status_code != 429:
+        return False
+    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+    if retry_after is None:
+        retry_after = 1.0
+    limiter.defer(retry_after)
+    return retry_after <= _config.max_retry_after
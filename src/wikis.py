@@ -0,0 +1,51 @@
+"""The MediaWiki sites a federated search fans out to"""
+from urllib.parse import urlsplit
+
+DEFAULT_WIKIS = ('en.wikipedia.org', 'de.wikipedia.org', 'fr.wikipedia.org', 'en.wiktionary.org')
+
+
+class Wiki:
+    """One searchable site: where its API is and where its articles live.
+
+    `name` is what the Source column shows, e.g. "de.wikipedia".
+    """
+
+    __slots__ = ('name', 'api_url', 'article_base')
+
+    def __init__(self, api_url, name=None, article_base=None):
+        self.api_url = api_url
+        parts = urlsplit(api_url)
+        if name is None:
+            # Drop the top-level domain: "de.wikipedia.org" -> "de.wikipedia"
+            host, _, tld = parts.netloc.rpartition('.')
+            name = host if host and tld.isalpha() else parts.netloc
+        self.name = name
+        if article_base is None:
+            # MediaWiki's default layout: /w/api.php next to /wiki/<title>
+            path = parts.path.rsplit('/w/', 1)[0] if '/w/' in parts.path else ''
+            article_base = f"{parts.scheme}://{parts.netloc}{path}/wiki/"
+        self.article_base = article_base
+
+    @classmethod
+    def from_spec(cls, spec):
+        """A Wiki from a host ("de.wikipedia.org") or a full api.php URL,
+        optionally named: "Deutsch=de.wikipedia.org"
+        """
+        name = None
+        if '=' in spec.split('://', 1)[0]:
+            name, spec = spec.split('=', 1)
+            name = name.strip()
+        spec = spec.strip()
+        if '://' not in spec:
+            spec = f"https://{spec}/w/api.php"
+        return cls(spec, name)
+
+    def __repr__(self):
+        return f"<Wiki {self.name} {self.api_url}>"
+
+
+def parse_wikis(specs):
+    """Wikis from a comma-separated string or a list of hosts/URLs"""
+    if isinstance(specs, str):
+        specs = specs.split(',')
+    return [Wiki.from_spec(spec) for spec in specs if spec.strip()]
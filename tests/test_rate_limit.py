@@ -0,0 +1,135 @@
+import os
+import sys
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+import pytest
+
+from rate_limit import TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    """A monotonic clock that only moves when slept on or advanced"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_bucket(clock, rate=8, capacity=5):
+    return TokenBucket(rate, capacity, clock=clock, sleep=clock.sleep)
+
+
+def test_burst_up_to_capacity_is_free(clock):
+    bucket = make_bucket(clock)
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+
+
+def test_exhausted_burst_waits_one_token_each(clock):
+    bucket = make_bucket(clock)
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.sleeps == []
+    assert bucket.reserve() == pytest.approx(0.125)
+    assert bucket.reserve() == pytest.approx(0.25)
+
+
+def test_acquire_sleeps_on_the_clock(clock):
+    bucket = make_bucket(clock)
+    for _ in range(6):
+        bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.125)]
+
+
+def test_refill_rate(clock):
+    bucket = make_bucket(clock)
+    for _ in range(5):
+        bucket.reserve()
+    clock.advance(0.375)  # three tokens back at 8/s
+    assert [bucket.reserve() for _ in range(3)] == [0.0] * 3
+    assert bucket.reserve() == pytest.approx(0.125)
+
+
+def test_refill_stops_at_capacity(clock):
+    bucket = make_bucket(clock)
+    clock.advance(60)
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve() == pytest.approx(0.125)
+
+
+def test_defer_holds_requests_back(clock):
+    bucket = make_bucket(clock)
+    bucket.defer(2.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+    clock.advance(1.5)
+    assert bucket.reserve() == pytest.approx(0.5)
+    clock.advance(0.5)
+    assert bucket.reserve() == 0.0
+
+
+def test_defer_keeps_the_later_deadline(clock):
+    bucket = make_bucket(clock)
+    bucket.defer(5.0)
+    bucket.defer(1.0)
+    assert bucket.reserve() == pytest.approx(5.0)
+
+
+def test_defer_honours_retry_after(clock):
+    bucket = make_bucket(clock)
+    bucket.defer(parse_retry_after("3"))
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(3.0)]
+
+
+def test_release_returns_a_token(clock):
+    bucket = make_bucket(clock)
+    for _ in range(5):
+        bucket.reserve()
+    bucket.release()
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.125)
+
+
+def test_release_stops_at_capacity(clock):
+    bucket = make_bucket(clock)
+    bucket.release()
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve() == pytest.approx(0.125)
+
+
+def test_parse_retry_after_delta_seconds():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 0 ") == 0.0
+
+
+def test_parse_retry_after_http_date():
+    now = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+    later = format_datetime(datetime(2024, 5, 1, 12, 0, 30, tzinfo=timezone.utc), usegmt=True)
+    assert parse_retry_after(later, now=now.timestamp()) == pytest.approx(30.0)
+
+
+def test_parse_retry_after_date_in_the_past():
+    now = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("Wed, 01 May 2024 11:00:00 GMT", now=now.timestamp()) == 0.0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "-5", "1.5", "Someday, 99 Foo"])
+def test_parse_retry_after_garbage(value):
+    assert parse_retry_after(value) is None
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+pytest.importorskip("PyQt6.QtTest")
+
+from PyQt6.QtCore import qInstallMessageHandler
+from PyQt6.QtTest import QAbstractItemModelTester
+from PyQt6.QtWidgets import QApplication
+
+from results import ResultSet
+from results_model import ResultsTableModel
+
+
+def results(prefix, count):
+    titles = [f"{prefix} {i}" for i in range(count)]
+    return ResultSet(titles, [f"about {title}" for title in titles])
+
+
+@pytest.fixture
+def failures():
+    app = QApplication.instance() or QApplication([])
+    messages = []
+    qInstallMessageHandler(lambda kind, context, message: messages.append(message))
+    yield messages
+    qInstallMessageHandler(None)
+
+
+def test_model_passes_the_item_model_tester(failures):
+    model = ResultsTableModel()
+    tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+    model.set_articles(results("a", 50))
+    model.update_articles(results("a", 80)[::2])
+    model.append_articles(results("b", 5))
+    model.clear()
+    assert [m for m in failures if m.startswith("FAIL")] == []
+    del tester
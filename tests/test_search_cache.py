@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+import pytest
+
+from results import ResultSet
+from search_cache import SearchCache, _Entry
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def results(prefix, count):
+    titles = [f"{prefix} {i}" for i in range(count)]
+    return ResultSet(titles, [f"about {title}" for title in titles])
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = SearchCache(tmp_path / "cache.sqlite3", ttl=100, clock=clock)
+    yield cache
+    cache.close()
+
+
+def test_covers_smaller_limits():
+    entry = _Entry(20, results("a", 20), 0)
+    assert entry.covers(5) and entry.covers(20)
+    assert not entry.covers(21)
+
+
+def test_short_result_covers_any_limit():
+    entry = _Entry(20, results("a", 3), 0)
+    assert entry.covers(500)
+
+
+def test_miss_then_hit(cache):
+    assert cache.get("python", 10) is None
+    cache.put("python", 10, results("python", 10))
+    assert cache.get("  Python ", 10).titles == results("python", 10).titles
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_wider_result_answers_narrower_limit(cache):
+    cache.put("python", 20, results("python", 20))
+    assert cache.get("python", 5).titles == results("python", 5).titles
+    assert cache.get("python", 50) is None
+
+
+def test_namespaces_are_separate(cache):
+    cache.put("python", 10, results("python", 10), namespace=0)
+    assert cache.get("python", 10, namespace=14) is None
+
+
+def test_get_returns_a_copy(cache):
+    cache.put("python", 10, results("python", 10))
+    cache.get("python", 10).titles[0] = "edited"
+    assert cache.get("python", 10).titles[0] == "python 0"
+
+
+def test_entries_expire(cache, clock):
+    cache.put("python", 10, results("python", 10))
+    clock.now += 101
+    assert cache.get("python", 10) is None
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path, clock):
+    first = SearchCache(tmp_path / "cache.sqlite3", ttl=100, clock=clock)
+    first.put("python", 10, results("python", 10))
+    first.close()
+    second = SearchCache(tmp_path / "cache.sqlite3", ttl=100, clock=clock)
+    assert second.get("python", 10).titles == results("python", 10).titles
+    assert second.stats()['disk_hits'] == 1
+    second.close()
+
+
+def test_put_keeps_a_fresh_wider_result(cache, clock):
+    cache.put("python", 20, results("old", 20))
+    clock.now += 50
+    cache.put("python", 5, results("new", 5))
+    assert cache.get("python", 20).titles == results("old", 20).titles
+    # ...without extending its lifetime
+    clock.now += 51
+    assert cache.get("python", 20) is None
+
+
+def test_put_replaces_an_expired_wider_result(cache, clock):
+    cache.put("python", 20, results("old", 20))
+    clock.now += 101
+    assert cache.get("python", 5) is None
+    cache.put("python", 5, results("new", 5))
+    assert cache.get("python", 5).titles == results("new", 5).titles
+
+
+def test_close_purges_expired_rows(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    cache = SearchCache(path, ttl=100, clock=clock)
+    cache.put("p", 10, results("p", 10))
+    clock.now += 101
+    cache.put("py", 10, results("py", 10))
+    cache.close()
+    with sqlite3.connect(str(path)) as db:
+        assert [row[0] for row in db.execute("SELECT query FROM results")] == ["py"]
@@ -0,0 +1,85 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+import pytest
+
+import wiki_http
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answers 429 with the server's Retry-After until `throttled` runs out"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if server.throttled > 0:
+            server.throttled -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", server.retry_after)
+            body = b""
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            body = b'["q", [], [], []]'
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+    httpd.requests = 0
+    httpd.throttled = 0
+    httpd.retry_after = "0"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def api_url(server):
+    url = f"http://127.0.0.1:{server.server_address[1]}/w/api.php"
+    saved = wiki_http.get_config()
+    wiki_http.configure(wiki_http.HttpClientConfig(
+        api_url=url, requests_per_second=100, burst=10, max_retry_after=1.0))
+    yield url
+    wiki_http.configure(saved)
+
+
+def test_long_retry_after_returns_the_429_at_once(server, api_url):
+    server.throttled = 10
+    server.retry_after = "3"
+    start = time.perf_counter()
+    response = wiki_http.api_get({'action': 'opensearch'})
+    assert response.status_code == 429
+    assert time.perf_counter() - start < 1.0
+    assert server.requests == 1
+    # Every later request to the host waits out the Retry-After
+    assert wiki_http.get_rate_limiter().reserve() == pytest.approx(3.0, abs=0.5)
+
+
+def test_short_retry_after_is_retried_once(server, api_url):
+    server.throttled = 1
+    response = wiki_http.api_get({'action': 'opensearch'})
+    assert response.status_code == 200
+    assert server.requests == 2
+
+
+def test_only_one_retry_after_a_429(server, api_url):
+    server.throttled = 10
+    response = wiki_http.api_get({'action': 'opensearch'})
+    assert response.status_code == 429
+    assert server.requests == 2